@@ -1,26 +1,40 @@
 """Caesar Cipher
 
-encrypt(text, offset[, factor]):
+check_key(factor, alphabet[, offset]):
+    Checks that factor is invertible modulo the size of the alphabet
+    and that factor and offset are ints
+
+    factor : int
+    alphabet : Alphabet
+    offset : int
+
+encrypt(text, offset[, factor, alphabet, low_memory]):
     Encrypts text using the Affine Caesar cipher
 
-    E(x) = (factor * x + offset) % 26
+    E(x) = (factor * x + offset) % len(alphabet)
 
-    text : string
+    text : string, bytearray or memoryview
     offset : int
     factor : int
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
 
-decrypt(text, offset[, factor]):
+decrypt(text, offset[, factor, alphabet, low_memory]):
     Decrypts text using the Affine Caesar cipher
 
-    D(x) = factor^-1 * (x - offset) % 26
+    D(x) = factor^-1 * (x - offset) % len(alphabet)
 
-    text : string
+    text : string, bytearray or memoryview
     offset : int
     factor : int
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
 """
 
 
+import numpy as np
 import utils
+from alphabet import Alphabet, UPPERCASE
 
 
 class CaesarError(Exception):
@@ -30,56 +44,59 @@ class CaesarError(Exception):
         print message
 
 
-def encrypt(text, offset, factor=1):
-    """Encrypts text
+def check_key(factor, alphabet, offset=0):
+    """Makes sure the factor, the alphabet and the offset form a valid key
 
-    letter : character
+    factor : int
+    alphabet : Alphabet
+    offset : int
     """
-    if type(text) is not str:
-        raise CaesarError('Can only encrypt strings.')
-    offset = offset % 26
-    if factor % 2 == 0 or factor % 13 == 0:
-        raise CaesarError("factor value must not be divisible by 2 or 13.")
-    factor = factor % 26
-
-    def encrypt_letter(letter):
-        """Encypts a sinlge letter
+    if not isinstance(alphabet, Alphabet):
+        raise CaesarError('alphabet must be an Alphabet.')
+    if type(factor) not in (int, long):
+        raise CaesarError('factor must be int.')
+    if type(offset) not in (int, long):
+        raise CaesarError('offset must be int.')
+    if utils.extended_gcd(factor, alphabet.size)[0] != 1:
+        raise CaesarError("factor value must be coprime to " +
+                          str(alphabet.size) + ".")
+
+
+def encrypt(text, offset, factor=1, alphabet=UPPERCASE,
+            low_memory=False):
+    """Encrypts text
 
-        letter : character
-        """
-        if not utils.is_letter(letter):
-            raise CaesarError("`letter` must be a single English \
-capital letter.")
+    E(x) = (factor * x + offset) % len(alphabet)
 
-        A = ord('A')
-        return chr((factor * (ord(letter) - A) + offset) % 26 + A)
+    The result has the same type as text. In low memory mode the text is
+    processed in chunks, written straight into the result.
+    """
+    if not utils.is_text(text):
+        raise CaesarError('Can only encrypt strings or bytes.')
+    check_key(factor, alphabet, offset)
 
-    return ''.join([encrypt_letter(letter) for letter in utils.fix_text(text)])
+    # reduced first, so that the table stays an int array for any long
+    factor, offset = factor % alphabet.size, offset % alphabet.size
+    table = (factor * np.arange(alphabet.size) + offset) % alphabet.size
+    return alphabet.transform(text, lambda indices, _: table[indices],
+                              utils.chunk_size(low_memory))
 
 
-def decrypt(text, offset, factor=1):
+def decrypt(text, offset, factor=1, alphabet=UPPERCASE,
+            low_memory=False):
     """Decrypts text
 
-    letter : character
+    D(x) = factor^-1 * (x - offset) % len(alphabet)
+
+    The result has the same type as text. In low memory mode the text is
+    processed in chunks, written straight into the result.
     """
-    if type(text) is not str:
-        raise CaesarError('Can only decrypt strings.')
-    offset = offset % 26
-    if factor % 2 == 0 or factor % 13 == 0:
-        raise CaesarError("factor value must not be divisible by 2 or 13.")
-    factor = factor % 26
-    factor_inv = utils.modinv(factor, 26)
-
-    def decrypt_letter(letter):
-        """Decrypts a single letter
-
-        letter : character
-        """
-        if not utils.is_letter(letter):
-            raise CaesarError("`letter` must be a single English \
-capital letter.")
-
-        A = ord('A')
-        return chr((factor_inv * (ord(letter) - A - offset)) % 26 + A)
-
-    return ''.join([decrypt_letter(letter) for letter in utils.fix_text(text)])
+    if not utils.is_text(text):
+        raise CaesarError('Can only decrypt strings or bytes.')
+    check_key(factor, alphabet, offset)
+    factor_inv = utils.modinv(factor % alphabet.size, alphabet.size)
+    offset %= alphabet.size
+
+    table = (factor_inv * (np.arange(alphabet.size) - offset)) % alphabet.size
+    return alphabet.transform(text, lambda indices, _: table[indices],
+                              utils.chunk_size(low_memory))
@@ -1,25 +1,30 @@
 """One-Time Pad cipher
 
-encrypt(text, key):
+encrypt(text, key[, alphabet, low_memory]):
     Encrypts text using the One-Time Pad cipher
 
-    E(x) = Vigenere.encrypt(text, key)
+    E(x) = Vigenere.encrypt(text, key, alphabet, low_memory)
 
-    text : string
-    key : string
+    text : string, bytearray or memoryview
+    key : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
 
-decrypt(text, key):
+decrypt(text, key[, alphabet, low_memory]):
     Decrypts text using the One-Time Pad cipher
 
-    D(x) = Vigenere.decrypt(text, key)
+    D(x) = Vigenere.decrypt(text, key, alphabet, low_memory)
 
-    text : string
-    key : string
+    text : string, bytearray or memoryview
+    key : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
 """
 
 
 import utils
 import Vigenere
+from alphabet import UPPERCASE
 
 
 class OneTimePadError(Exception):
@@ -29,37 +34,47 @@ class OneTimePadError(Exception):
         print message
 
 
-def encrypt(text, key):
+def encrypt(text, key, alphabet=UPPERCASE, low_memory=False):
     """Encrypts text using the One-Time Pad cipher
 
-    E(x) = Vigenere.encrypt(text, key)
+    E(x) = Vigenere.encrypt(text, key, alphabet, low_memory)
 
-    text : string
-    key : string
+    text : string, bytearray or memoryview
+    key : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
     """
-    if type(text) is not str:
-        raise OneTimePadError('Can only encrypt strings.')
-    if type(key) is not str:
-        raise OneTimePadError('key must be a string.')
+    if not utils.is_text(text):
+        raise OneTimePadError('Can only encrypt strings or bytes.')
+    if not utils.is_text(key):
+        raise OneTimePadError('key must be a string or bytes.')
     if len(key) < len(text):
         raise OneTimePadError('key must be at least the same length as text.')
 
-    return Vigenere.encrypt(utils.fix_text(text), utils.fix_text(key))
+    symbols = Vigenere.normalize_password(key, alphabet, low_memory,
+                                          OneTimePadError)
+    return Vigenere.shift(text, symbols, alphabet, 1, low_memory,
+                          OneTimePadError)
 
 
-def decrypt(text, key):
+def decrypt(text, key, alphabet=UPPERCASE, low_memory=False):
     """Decrypts text using the One-Time Pad cipher
 
-    D(x) = Vigenere.decrypt(text, key)
+    D(x) = Vigenere.decrypt(text, key, alphabet, low_memory)
 
-    text : string
-    key : string
+    text : string, bytearray or memoryview
+    key : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
     """
-    if type(text) is not str:
-        raise OneTimePadError('Can only encrypt strings.')
-    if type(key) is not str:
-        raise OneTimePadError('key must be a string.')
+    if not utils.is_text(text):
+        raise OneTimePadError('Can only encrypt strings or bytes.')
+    if not utils.is_text(key):
+        raise OneTimePadError('key must be a string or bytes.')
     if len(key) < len(text):
         raise OneTimePadError('key must be at least the same length as text.')
 
-    return Vigenere.decrypt(utils.fix_text(text), utils.fix_text(key))
+    symbols = Vigenere.normalize_password(key, alphabet, low_memory,
+                                          OneTimePadError)
+    return Vigenere.shift(text, symbols, alphabet, -1, low_memory,
+                          OneTimePadError)
@@ -8,44 +8,98 @@ check_padding(padding, which_pad):
     padding : character
     which_pad : "double" | "end" | "alternate end"
 
+generate_order(password):
+    Generates the grid as an array of 25 letter indices, read row by row
+
+    password : string, bytearray or memoryview
+
 generate_grid(password):
     Generates the grid in the form of a dictionary
     Each letter is translated into a tuple of row and collumn
 
-    password : string
+    password : string, bytearray or memoryview
+
+shift_digraphs(order, first, second[, shift]):
+    Replaces the digraphs (first, second) according to the grid order,
+    or to each of several grid orders at once
+
+    order : array of 25 letter indices, or rows of them
+    first, second : arrays of letter indices
+    shift : 1 to encrypt | -1 to decrypt
+
+generate_table(password[, shift]):
+    Generates the digraph table of the grid
+    Row 25 * a + b holds the letter indices the digraph (a, b) becomes
+
+    password : string, bytearray or memoryview
+    shift : 1 to encrypt | -1 to decrypt
+
+pad_chunks(chunks[, double_padding, end_padding]):
+    Inserts the padding into chunks of letter indices,
+    so that every chunk splits into digraphs
+
+    chunks : iterable of arrays of int
+    double_padding : character
+    end_padding : character
+    alternate_end_pad : character
+
+pad_digraphs(letters[, double_padding, end_padding]):
+    Inserts the padding into an array of letter indices,
+    so that it splits into digraphs
+
+    letters : array of int
+    double_padding : character
+    end_padding : character
+    alternate_end_pad : character
 
 generate_digraphs(text[, double_padding, end_padding]):
     Generates digraphs
 
-    In order to not make use of too much space in large texts,
-    it yields each digraph
+    text : string, bytearray or memoryview
+    double_padding : character
+    end_padding : character
+    alternate_end_pad : character
+
+translate(text, table, double_padding, end_padding, alternate_end_padding,
+          low_memory):
+    Replaces every digraph of text according to the digraph table
 
-    text : string
+    text : string, bytearray or memoryview
+    table : digraph table, from generate_table
     double_padding : character
     end_padding : character
     alternate_end_pad : character
+    low_memory : bool
 
-encrypt(text, password[, double_padding, end_padding]):
+encrypt(text, password[, double_padding, end_padding, low_memory]):
     Encrypts text using the Playfair cipher
 
-    text : string
-    password : string
+    text : string, bytearray or memoryview
+    password : string, bytearray or memoryview
     double_padding : character
     end_padding : character
     alternate_end_pad : character
+    low_memory : bool
 
-decrypt(text, password[, double_padding, end_padding]):
+decrypt(text, password[, double_padding, end_padding, low_memory]):
     Decrypts text using the Playfair cipher
 
-    text : string
-    password : string
+    text : string, bytearray or memoryview
+    password : string, bytearray or memoryview
     double_padding : character
     end_padding : character
     alternate_end_pad : character
+    low_memory : bool
 """
 
 
+import numpy as np
 import utils
+from alphabet import Alphabet
+
+
+ALPHABET = Alphabet("ABCDEFGHIKLMNOPQRSTUVWXYZ", fold_case=True,
+                    aliases={'J': 'I'})
 
 
 class PlayfairError(Exception):
@@ -72,158 +126,223 @@ be a letter of the alphabet.')
     return padding if padding != 'J' else 'I'
 
 
+def generate_order(password):
+    """Generates the grid as an array of 25 letter indices, read row by row
+
+    The letters of the password come first, in order of first appearance,
+    followed by the rest of the alphabet.
+
+    password : string, bytearray or memoryview
+    """
+    if not utils.is_text(password):
+        raise PlayfairError('Password must be a string or bytes.')
+    password = ALPHABET.encode(password)
+    _, first = np.unique(password, return_index=True)
+    password = password[np.sort(first)]
+    return np.concatenate([password,
+                           np.setdiff1d(np.arange(ALPHABET.size), password)])
+
+
 def generate_grid(password):
     """Generates the grid in the form of a dictionary
     Each letter is translated into a tuple of row and collumn
 
-    password : string
+    password : string, bytearray or memoryview
     """
-    if type(password) is not str:
-        raise PlayfairError('Password must be a string.')
-    alphabet = "ABCDEFGHIKLMNOPQRSTUVWXYZ"
     grid = dict()
     rev_grid = dict()
-    password = utils.fix_text(password)
-
-    i = 0
-    for letter in password:
-        if letter == 'J':
-            letter = 'I'
-        if letter not in grid:
-            grid[letter] = (i / 5, i % 5)
-            alphabet = alphabet.replace(letter, '')
-            i += 1
-
-    for letter in alphabet:
+    for i, letter in enumerate(ALPHABET.decode(generate_order(password))):
         grid[letter] = (i / 5, i % 5)
-        i += 1
-
-    for key, value in grid.iteritems():
-        rev_grid[value] = key
+        rev_grid[(i / 5, i % 5)] = letter
     return grid, rev_grid
 
 
-def generate_digraphs(text, double_padding='X', end_padding='Z',
-                      alternate_end_padding='Z'):
-    """Splits the text into digraphs
+def shift_digraphs(order, first, second, shift=1):
+    """Replaces the digraphs (first, second) according to the grid order
+
+    order may hold a single grid, or one grid per row, in which case every
+    digraph is replaced according to every grid.
+
+    order : array of 25 letter indices, or rows of them
+    first, second : arrays of letter indices
+    shift : 1 to encrypt | -1 to decrypt
+    """
+    position = np.argsort(order, axis=-1)
+    row, col = position / 5, position % 5
+    row1, col1 = row[..., first], col[..., first]
+    row2, col2 = row[..., second], col[..., second]
+
+    same_row = row1 == row2
+    same_col = (col1 == col2) & ~same_row
+    # Same row: shift along the row, Same collumn: shift along the collumn
+    # Different row and collumn: swap the collumns
+    new_col1 = np.where(same_row, (col1 + shift) % 5,
+                        np.where(same_col, col1, col2))
+    new_col2 = np.where(same_row, (col2 + shift) % 5,
+                        np.where(same_col, col2, col1))
+    new_row1 = np.where(same_col, (row1 + shift) % 5, row1)
+    new_row2 = np.where(same_col, (row2 + shift) % 5, row2)
+    return (np.take_along_axis(order, 5 * new_row1 + new_col1, -1),
+            np.take_along_axis(order, 5 * new_row2 + new_col2, -1))
+
+
+def generate_table(password, shift=1):
+    """Generates the digraph table of the grid
+
+    Row 25 * a + b holds the letter indices that the digraph (a, b) is
+    replaced with, so a whole text is translated with one lookup.
+
+    password : string, bytearray or memoryview
+    shift : 1 to encrypt | -1 to decrypt
+    """
+    first, second = np.divmod(np.arange(ALPHABET.size ** 2), ALPHABET.size)
+    return np.column_stack(shift_digraphs(generate_order(password),
+                                          first, second, shift))
+
+
+def pad_chunks(chunks, double_padding='X', end_padding='Z',
+               alternate_end_padding='Z'):
+    """Inserts the padding into chunks of letter indices
+
+    Yields chunks of even length, so that no digraph is split between two
+    chunks. The last letter of an odd chunk is carried over to the next.
+
+    chunks : iterable of arrays of int
+    double_padding : character
+    end_padding : character
+    alternate_end_padding : character
+    """
+    double_padding, end_padding, alternate_end_padding = ALPHABET.encode(
+        check_padding(double_padding, "double") +
+        check_padding(end_padding, "end") +
+        check_padding(alternate_end_padding, "alternate end"))
+
+    carry = np.empty(0, dtype=np.int16)
+    for letters in chunks:
+        letters = np.concatenate([carry, letters])
+        # A double letter only needs padding when it falls on a digraph,
+        # and every padding shifts the digraphs after it by one letter
+        inserts = []
+        start = 0
+        for index in np.flatnonzero(letters[:-1] == letters[1:]):
+            if (index - start) % 2 == 0:
+                inserts.append(index + 1)
+                start = index + 1
+        letters = np.insert(letters, inserts, double_padding)
+        split = len(letters) - len(letters) % 2
+        carry = letters[split:]
+        yield letters[:split]
+
+    if len(carry):
+        # we have reached the end of the text
+        yield np.append(carry, end_padding if carry[-1] != end_padding
+                        else alternate_end_padding)
+
+
+def pad_digraphs(letters, double_padding='X', end_padding='Z',
+                 alternate_end_padding='Z'):
+    """Inserts the padding into an array of letter indices
 
     if a digraph consists of a double letter, double_padding is introduced
     between them. If at the end of the text we have an odd number of letters,
     an end_padding is introdiced.
 
-    text : string
+    letters : array of int
     double_padding : character
     end_padding : character
     alternate_end_padding : character
     """
-    double_padding = check_padding(double_padding, "double")
-    end_padding = check_padding(end_padding, "end")
-    alternate_end_padding = check_padding(
-            alternate_end_padding, "alternate end")
-    text = utils.fix_text(text)
-    text = text.replace('J', 'I')
-
-    counter = 0
-
-    while counter < len(text):
-        if counter + 1 == len(text):
-            # we have reached the end of the text_fixed
-            if text[counter] != end_padding:
-                yield text[counter] + end_padding
-            else:
-                yield text[counter] + alternate_end_padding
-            break
-        elif text[counter] != text[counter + 1]:
-            # we just need to create a normal digraph
-            yield text[counter] + text[counter + 1]
-            counter += 2
-        else:
-            # we have a double letter digraph, so we add the double padding
-            yield text[counter] + double_padding
-            counter += 1
+    return np.concatenate(list(pad_chunks(
+        [letters], double_padding, end_padding, alternate_end_padding)) +
+        [np.empty(0, dtype=np.int16)])
 
 
-def encrypt(text, password, double_padding='X', end_padding='Z',
-            alternate_end_padding='X'):
-    """Encrypts text using the Playfair cipher
+def generate_digraphs(text, double_padding='X', end_padding='Z',
+                      alternate_end_padding='Z'):
+    """Splits the text into digraphs
+
+    if a digraph consists of a double letter, double_padding is introduced
+    between them. If at the end of the text we have an odd number of letters,
+    an end_padding is introdiced. The text is read in chunks, so only one
+    chunk of it is held at a time.
 
-    text : string
-    password : string
+    text : string, bytearray or memoryview
     double_padding : character
     end_padding : character
+    alternate_end_padding : character
     """
-    if type(text) is not str:
-        raise PlayfairError('Can only encrypt strings.')
+    for letters in pad_chunks(ALPHABET.encode_chunks(text,
+                                                     utils.chunk_size(True)),
+                              double_padding, end_padding,
+                              alternate_end_padding):
+        letters = ALPHABET.decode(letters)
+        for counter in xrange(0, len(letters), 2):
+            yield letters[counter:counter + 2]
 
-    grid, rev_grid = generate_grid(password)
 
-    def encrypt_digraph(digraph):
-        """Encrypts a single digraph
+def translate(text, table, double_padding, end_padding,
+              alternate_end_padding, low_memory):
+    """Replaces every digraph of text according to the digraph table
 
-        digrpah : 2 characters generated by generate_digraphs
-        """
-        first_pos = grid[digraph[0]]
-        second_pos = grid[digraph[1]]
+    In low memory mode the text is read twice in chunks, first to size the
+    result and then to fill it.
 
-        if first_pos[0] == second_pos[0]:
-            # Same row
-            first_encr = rev_grid[(first_pos[0], (first_pos[1] + 1) % 5)]
-            second_encr = rev_grid[(second_pos[0], (second_pos[1] + 1) % 5)]
+    text : string, bytearray or memoryview
+    table : digraph table, from generate_table
+    double_padding : character
+    end_padding : character
+    alternate_end_padding : character
+    low_memory : bool
+    """
+    chunk_size = utils.chunk_size(low_memory)
 
-        elif first_pos[1] == second_pos[1]:
-            # Same collumn
-            first_encr = rev_grid[((first_pos[0] + 1) % 5, first_pos[1])]
-            second_encr = rev_grid[((second_pos[0] + 1) % 5, second_pos[1])]
+    def chunks():
+        """Yields the padded letters of text, chunk by chunk"""
+        return pad_chunks(ALPHABET.encode_chunks(text, chunk_size),
+                          double_padding, end_padding, alternate_end_padding)
 
-        else:
-            # Different row and collumn
-            first_encr = rev_grid[(first_pos[0], second_pos[1])]
-            second_encr = rev_grid[(second_pos[0], first_pos[1])]
+    length = sum([len(letters) for letters in chunks()]) \
+        if low_memory else None
+    return ALPHABET.decode_chunks(
+        (table[letters[0::2] * ALPHABET.size + letters[1::2]].ravel()
+         for letters in chunks()), length, type(text))
 
-        return first_encr + second_encr
 
-    return ''.join([encrypt_digraph(digraph) for digraph in generate_digraphs(
-                text, double_padding, end_padding, alternate_end_padding)])
+def encrypt(text, password, double_padding='X', end_padding='Z',
+            alternate_end_padding='X', low_memory=False):
+    """Encrypts text using the Playfair cipher
 
+    The result has the same type as text. In low memory mode the text is
+    processed in chunks, written straight into the result.
 
-def decrypt(text, password, double_padding='X', end_padding='Z',
-            alternate_end_padding='X'):
-    """Decrypts text using the Playfair cipher
-
-    text : string
-    password : string
+    text : string, bytearray or memoryview
+    password : string, bytearray or memoryview
     double_padding : character
     end_padding : character
+    low_memory : bool
     """
-    if type(text) is not str:
-        raise PlayfairError('Can only encrypt strings.')
-
-    grid, rev_grid = generate_grid(password)
+    if not utils.is_text(text):
+        raise PlayfairError('Can only encrypt strings or bytes.')
 
-    def decrypt_digraph(digraph):
-        """Decrypts a single digraph
+    return translate(text, generate_table(password, 1), double_padding,
+                     end_padding, alternate_end_padding, low_memory)
 
-        digrpah : 2 characters generated by generate_digraphs
-        """
-        first_pos = grid[digraph[0]]
-        second_pos = grid[digraph[1]]
 
-        if first_pos[0] == second_pos[0]:
-            # Same row
-            first_encr = rev_grid[(first_pos[0], (first_pos[1] - 1) % 5)]
-            second_encr = rev_grid[(second_pos[0], (second_pos[1] - 1) % 5)]
-
-        elif first_pos[1] == second_pos[1]:
-            # Same collumn
-            first_encr = rev_grid[((first_pos[0] - 1) % 5, first_pos[1])]
-            second_encr = rev_grid[((second_pos[0] - 1) % 5, second_pos[1])]
+def decrypt(text, password, double_padding='X', end_padding='Z',
+            alternate_end_padding='X', low_memory=False):
+    """Decrypts text using the Playfair cipher
 
-        else:
-            # Different row and collum
-            first_encr = rev_grid[(first_pos[0], second_pos[1])]
-            second_encr = rev_grid[(second_pos[0], first_pos[1])]
+    The result has the same type as text. In low memory mode the text is
+    processed in chunks, written straight into the result.
 
-        return first_encr + second_encr
+    text : string, bytearray or memoryview
+    password : string, bytearray or memoryview
+    double_padding : character
+    end_padding : character
+    low_memory : bool
+    """
+    if not utils.is_text(text):
+        raise PlayfairError('Can only decrypt strings or bytes.')
 
-    return ''.join([decrypt_digraph(digraph) for digraph in generate_digraphs(
-                text, double_padding, end_padding, alternate_end_padding)])
+    return translate(text, generate_table(password, -1), double_padding,
+                     end_padding, alternate_end_padding, low_memory)
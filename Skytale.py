@@ -1,22 +1,31 @@
 """Skytale Cipher
 
-encrypt(text, size):
+wind(letters, output, size[, unwind]):
+    Copies letters into output in the order they are read off the scytale,
+    or back with unwind
+
+    letters, output : uint8 arrays of the same length
+    size : int
+    unwind : bool
+
+encrypt(text, size[, low_memory]):
     Encrypts text using the Scytale cipher
 
-    text : string
+    text : string, bytearray or memoryview
     size : int < len(text)
+    low_memory : bool
 
-decrypt(text, size):
+decrypt(text, size[, low_memory]):
     Decrypts text using the Scytale cipher
 
-    text : string
+    text : string, bytearray or memoryview
     size : int < len(text)
+    low_memory : bool
 """
 
 
 import utils
-import numpy as np
-import math
+from alphabet import UPPERCASE
 
 
 class SkytaleError(Exception):
@@ -26,53 +35,85 @@ class SkytaleError(Exception):
         print message
 
 
-def encrypt(text, size):
-    """Encrypts text using the Scytale cipher
+def check_size(text, size):
+    """Makes sure size is a valid collumn size for text
 
-    text : string
-    size : int < len(text)
+    text : string, bytearray or memoryview
+    size : int
     """
-    if type(text) is not str:
-        raise SkytaleError('Can only encrypt strings.')
     if type(size) is not int:
         raise SkytaleError('size must be int.')
+    if size < 1:
+        raise SkytaleError('size must be positive.')
     if not size < len(text):
         raise SkytaleError("the size of each collumn must be less than the \
 length of the text to be encrypted")
 
-    text = utils.fix_text(text)
-    width = int(math.ceil(len(text) / float(size)))
-    skytale = np.array(['0'] * width * size).reshape(size, width)
-    for i, letter in enumerate(text):
-        skytale[i % size, i / size] = letter
 
-    skytale.flatten()
-    cipher_text = ''.join(str(skytale))
-    cipher_text = utils.fix_text(cipher_text)
-    return cipher_text
+def wind(letters, output, size, unwind=False):
+    """Copies letters into output in the order they are read off the scytale
 
+    The grid is copied in two rectangular blocks, the rows that reach into
+    the last collumn and those that do not, so no index array is needed.
+    With unwind, copies the other way round, from output into letters.
 
-def decrypt(text, size):
-    """Decrypts text using the Scytale cipher
+    letters, output : uint8 arrays of the same length
+    size : int
+    unwind : bool
+    """
+    width, rest = divmod(len(letters), size)
+    grid = letters[:width * size].reshape(width, size)
+    long_rows = output[:rest * (width + 1)].reshape(rest, width + 1)
+    short_rows = output[rest * (width + 1):].reshape(size - rest, width)
+    if unwind:
+        grid[:, :rest] = long_rows[:, :width].T
+        letters[width * size:] = long_rows[:, width]
+        grid[:, rest:] = short_rows.T
+    else:
+        long_rows[:, :width] = grid[:, :rest].T
+        long_rows[:, width] = letters[width * size:]
+        short_rows[...] = grid[:, rest:].T
+
+
+def encrypt(text, size, low_memory=False):
+    """Encrypts text using the Scytale cipher
+
+    The result has the same type as text. In low memory mode the text is
+    normalized in chunks.
 
-    text : string
+    text : string, bytearray or memoryview
     size : int < len(text)
+    low_memory : bool
     """
-    if type(text) is not str:
-        raise SkytaleError('Can only decrypt strings.')
-    if type(size) is not int:
-        raise SkytaleError('size must be int.')
-    if not size < len(text):
-        raise SkytaleError("the size of each collumn must be less than the \
-length of the text to be encrypted")
+    if not utils.is_text(text):
+        raise SkytaleError('Can only encrypt strings or bytes.')
+    check_size(text, size)
 
-    text = utils.fix_text(text)
-    width = int(math.ceil(len(text) / size))
-    skytale = np.array(['0'] * width * size).reshape(width, size)
-    for i, letter in enumerate(text):
-        skytale[i % width, i / width] = letter
+    letters = UPPERCASE.transform(text, lambda indices, _: indices,
+                                  utils.chunk_size(low_memory), bytearray)
+    output = bytearray(len(letters))
+    wind(utils.as_codes(letters), utils.as_codes(output), size)
+    del letters
+    return utils.convert(output, type(text))
 
-    skytale.flatten()
-    plain_text = ''.join(str(skytale))
-    plain_text = utils.fix_text(plain_text)
-    return plain_text
+
+def decrypt(text, size, low_memory=False):
+    """Decrypts text using the Scytale cipher
+
+    The result has the same type as text. In low memory mode the text is
+    normalized in chunks.
+
+    text : string, bytearray or memoryview
+    size : int < len(text)
+    low_memory : bool
+    """
+    if not utils.is_text(text):
+        raise SkytaleError('Can only decrypt strings or bytes.')
+    check_size(text, size)
+
+    letters = UPPERCASE.transform(text, lambda indices, _: indices,
+                                  utils.chunk_size(low_memory), bytearray)
+    output = bytearray(len(letters))
+    wind(utils.as_codes(output), utils.as_codes(letters), size, unwind=True)
+    del letters
+    return utils.convert(output, type(text))
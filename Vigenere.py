@@ -1,25 +1,61 @@
 """Vigenere Cipher
 
-encrypt(text, password):
+normalize_password(password, alphabet[, low_memory, error]):
+    Returns the character codes of the symbols of the password
+
+    password : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the password in chunks
+    error : exception class to raise, defaults to VigenereError
+
+generate_key(symbols, length, alphabet[, position]):
+    Repeats the indices of the password until they cover length symbols,
+    starting from symbol position of the text
+
+    symbols : array of character codes, from normalize_password
+    length : int
+    alphabet : Alphabet
+    position : int
+
+shift(text, symbols, alphabet, sign[, low_memory, error]):
+    Adds (sign 1) or subtracts (sign -1) the repeated password from the
+    symbols of text
+
+    A password without symbols is only rejected once a symbol of the text
+    needs it, so texts without symbols give an empty result.
+
+    text : string, bytearray or memoryview
+    symbols : array of character codes, from normalize_password
+    alphabet : Alphabet
+    sign : 1 | -1
+    low_memory : bool, process the text in chunks
+    error : exception class to raise, defaults to VigenereError
+
+encrypt(text, password[, alphabet, low_memory]):
     Encrypts text using the Vigenere cipher
 
-    E(text[i]) = (text[i] + password[i]) % 26
+    E(text[i]) = (text[i] + password[i]) % len(alphabet)
 
-    text : string
-    password : string
+    text : string, bytearray or memoryview
+    password : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
 
-decrypt(text, offset[, factor]):
+decrypt(text, password[, alphabet, low_memory]):
     Decrypts text using the Vigenere cipher
 
-    D(text[i]) = (text[i] - password[i]) % 26
+    D(text[i]) = (text[i] - password[i]) % len(alphabet)
 
-    text : string
-    password : string
+    text : string, bytearray or memoryview
+    password : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
 """
 
 
+import numpy as np
 import utils
-import Caesar
+from alphabet import Alphabet, UPPERCASE
 
 
 class VigenereError(Exception):
@@ -29,44 +65,105 @@ class VigenereError(Exception):
         print message
 
 
-def encrypt(text, password):
-    """Encrypts text using the Vigenere cipher
+def normalize_password(password, alphabet, low_memory=False,
+                       error=VigenereError):
+    """Returns the character codes of the symbols of the password
 
-    E(text[i]) = (text[i] + password[i]) % 26
+    The password is kept as one byte per symbol, since a One-Time Pad
+    password is as long as the text.
 
-    text : string
-    password : string
+    password : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the password in chunks
+    error : exception class to raise
     """
-    if type(text) is not str:
-        raise VigenereError('Can only encrypt strings.')
-    if type(password) is not str:
-        raise VigenereError('Password must be a string.')
+    if not utils.is_text(password):
+        raise error('Password must be a string or bytes.')
+    if not isinstance(alphabet, Alphabet):
+        raise error('alphabet must be an Alphabet.')
+    return utils.as_codes(alphabet.transform(
+        password, lambda indices, _: indices, utils.chunk_size(low_memory),
+        bytearray))
 
-    password = utils.fix_text(password)
 
-    length = len(password)
-    A = ord('A')
+def generate_key(symbols, length, alphabet, position=0):
+    """Repeats the password over length symbols of the alphabet
 
-    return ''.join([Caesar.encrypt(letter, ord(password[index % length])
-                    - A) for index, letter in enumerate(utils.fix_text(text))])
+    The key starts at symbol position of the text, so that a text can be
+    processed in chunks.
 
+    symbols : array of character codes, from normalize_password
+    length : int
+    alphabet : Alphabet
+    position : int
+    """
+    return alphabet.encoder[
+        symbols[(np.arange(length) + position) % len(symbols)]]
 
-def decrypt(text, password):
-    """Decrypts text using the Vigenere cipher
 
-    D(text[i]) = (text[i] - password[i]) % 26
+def shift(text, symbols, alphabet, sign, low_memory=False,
+          error=VigenereError):
+    """Adds or subtracts the repeated password from the symbols of text
 
-    text, password : string
+    A password without symbols is only rejected once a symbol of the text
+    needs it, like the original implementation.
+
+    text : string, bytearray or memoryview
+    symbols : array of character codes, from normalize_password
+    alphabet : Alphabet
+    sign : 1 | -1
+    low_memory : bool, process the text in chunks
+    error : exception class to raise
     """
-    if type(text) is not str:
-        raise VigenereError('Can only decrypt strings.')
-    if type(password) is not str:
-        raise VigenereError('Password must be a string.')
+    def shift_chunk(indices, position):
+        """Shifts the symbols of a chunk of text
+
+        indices : array of int
+        position : int, number of symbols before the chunk
+        """
+        if not len(indices):
+            return indices
+        if not len(symbols):
+            raise error('Password must contain a symbol of the alphabet.')
+        key = generate_key(symbols, len(indices), alphabet, position)
+        return (indices + sign * key) % alphabet.size
+
+    return alphabet.transform(text, shift_chunk, utils.chunk_size(low_memory))
+
+
+def encrypt(text, password, alphabet=UPPERCASE, low_memory=False):
+    """Encrypts text using the Vigenere cipher
 
-    password = utils.fix_text(password)
+    E(text[i]) = (text[i] + password[i]) % len(alphabet)
 
-    length = len(password)
-    A = ord('A')
+    The result has the same type as text. In low memory mode the text is
+    processed in chunks, written straight into the result.
 
-    return ''.join([Caesar.decrypt(letter, ord(password[index % length])
-                    - A) for index, letter in enumerate(utils.fix_text(text))])
+    text : string, bytearray or memoryview
+    password : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
+    """
+    if not utils.is_text(text):
+        raise VigenereError('Can only encrypt strings or bytes.')
+    symbols = normalize_password(password, alphabet, low_memory)
+    return shift(text, symbols, alphabet, 1, low_memory)
+
+
+def decrypt(text, password, alphabet=UPPERCASE, low_memory=False):
+    """Decrypts text using the Vigenere cipher
+
+    D(text[i]) = (text[i] - password[i]) % len(alphabet)
+
+    The result has the same type as text. In low memory mode the text is
+    processed in chunks, written straight into the result.
+
+    text : string, bytearray or memoryview
+    password : string, bytearray or memoryview
+    alphabet : Alphabet
+    low_memory : bool, process the text in chunks
+    """
+    if not utils.is_text(text):
+        raise VigenereError('Can only decrypt strings or bytes.')
+    symbols = normalize_password(password, alphabet, low_memory)
+    return shift(text, symbols, alphabet, -1, low_memory)
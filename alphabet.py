@@ -0,0 +1,227 @@
+"""Alphabets for the PyCiphers library
+
+Alphabet(symbols[, fold_case, aliases]):
+    An ordered set of symbols that a cipher works over
+
+    The alphabet is compiled into two dense lookup arrays, so that
+    translating a whole text to indices and back is a single table lookup.
+
+    symbols : string of unique characters
+    fold_case : bool, also accept the other case of each symbol
+    aliases : dict, maps extra characters onto symbols (e.g. {'J': 'I'})
+
+Alphabet.encode(text):
+    Returns the indices of all characters of text that belong to the
+    alphabet, dropping the rest
+
+    text : string, bytearray or memoryview
+
+Alphabet.decode(indices[, output_type]):
+    Returns the text made of the symbols at indices
+
+    indices : array of int
+    output_type : str | bytearray | memoryview
+
+Alphabet.encode_chunks(text[, chunk_size]):
+    Yields the indices of text, chunk_size characters of text at a time
+
+    text : string, bytearray or memoryview
+    chunk_size : int, None for the whole text at once
+
+Alphabet.decode_chunks(chunks[, length, output_type]):
+    Returns the text made of the symbols at the indices of every chunk
+
+    When the length of the result is known, the symbols are written into
+    a single preallocated buffer.
+
+    chunks : iterable of arrays of int
+    length : int
+    output_type : str | bytearray | memoryview
+
+Alphabet.transform(text, function[, chunk_size, output_type]):
+    Replaces the indices of text with function(indices, position), where
+    position is the number of symbols before the chunk
+
+    text : string, bytearray or memoryview
+    function : function
+    chunk_size : int, None for the whole text at once
+    output_type : str | bytearray | memoryview
+
+Alphabet.normalize(text):
+    Removes all characters that do not belong to the alphabet and replaces
+    the rest with their canonical symbol
+
+    text : string, bytearray or memoryview
+
+UPPERCASE:
+    The 26 English capital letters, folding lower case letters
+
+ALPHANUMERIC:
+    The 26 English capital letters followed by the 10 digits
+
+LATIN1:
+    All 256 Latin-1 characters, so no character is ever dropped
+"""
+
+
+import string
+import numpy as np
+import utils
+
+
+class AlphabetError(Exception):
+    """Alphabet Exception Class"""
+    def __init__(self, message):
+        super(AlphabetError, self).__init__(message)
+        print message
+
+
+class Alphabet(object):
+    """An ordered set of symbols compiled into encode/decode lookup arrays
+
+    encoder : int16 array of length 256, index of each character or -1
+    decoder : uint8 array of length size, character code of each index
+    translation, deletions : the same mapping as arguments of str.translate
+    """
+    def __init__(self, symbols, fold_case=False, aliases=None):
+        if type(symbols) is not str:
+            raise AlphabetError('symbols must be a string.')
+        if len(symbols) < 2:
+            raise AlphabetError('An alphabet needs at least two symbols.')
+        if len(set(symbols)) != len(symbols):
+            raise AlphabetError('symbols must not contain duplicates.')
+
+        self.symbols = symbols
+        self.size = len(symbols)
+        self.decoder = np.frombuffer(symbols, dtype=np.uint8).copy()
+        self.encoder = np.empty(256, dtype=np.int16)
+        self.encoder.fill(-1)
+        self.encoder[self.decoder] = np.arange(self.size)
+
+        extra = dict((letter, letter) for letter in symbols)
+        extra.update(aliases or {})
+        for alias, symbol in sorted(extra.iteritems()):
+            if symbol not in symbols:
+                raise AlphabetError('alias ' + repr(alias) + ' must map onto \
+a symbol of the alphabet.')
+            variants = [alias]
+            if fold_case:
+                variants += [alias.lower(), alias.upper()]
+            for variant in variants:
+                if variant == alias or self.encoder[ord(variant)] == -1:
+                    self.encoder[ord(variant)] = symbols.index(symbol)
+
+        # the same mapping as a str.translate table, for short texts
+        self.translation = self.decoder[self.encoder % self.size].tostring()
+        self.deletions = np.flatnonzero(self.encoder < 0).astype(
+            np.uint8).tostring()
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return 'Alphabet(' + repr(self.symbols) + ')'
+
+    def encode(self, text):
+        """Returns the indices of the characters of text in the alphabet
+
+        Characters that do not belong to the alphabet are dropped.
+
+        text : string, bytearray or memoryview
+        """
+        indices = self.encoder[utils.as_codes(text)]
+        return indices[indices >= 0]
+
+    def decode(self, indices, output_type=str):
+        """Returns the text made of the symbols at indices
+
+        indices : array of int
+        output_type : str | bytearray | memoryview
+        """
+        if output_type is bytearray:
+            output = bytearray(len(indices))
+            np.take(self.decoder, indices, out=utils.as_codes(output))
+            return output
+        output = self.decoder[indices].tostring()
+        return memoryview(output) if output_type is memoryview else output
+
+    def encode_chunks(self, text, chunk_size=None):
+        """Yields the indices of text, chunk_size characters at a time
+
+        text : string, bytearray or memoryview
+        chunk_size : int, None for the whole text at once
+        """
+        codes = utils.as_codes(text)
+        chunk_size = chunk_size or max(len(codes), 1)
+        for start in xrange(0, len(codes), chunk_size):
+            indices = self.encoder[codes[start:start + chunk_size]]
+            yield indices[indices >= 0]
+
+    def decode_chunks(self, chunks, length=None, output_type=str):
+        """Returns the text made of the symbols at the indices of every chunk
+
+        When length is given, the symbols are written straight into one
+        buffer of that size, instead of joining the chunks.
+
+        chunks : iterable of arrays of int
+        length : int, total number of indices
+        output_type : str | bytearray | memoryview
+        """
+        if length is None:
+            chunks = list(chunks)
+            return self.decode(np.concatenate(chunks) if chunks
+                               else np.empty(0, dtype=int), output_type)
+
+        output = bytearray(length)
+        codes = utils.as_codes(output)
+        position = 0
+        for indices in chunks:
+            np.take(self.decoder, indices,
+                    out=codes[position:position + len(indices)])
+            position += len(indices)
+        return utils.convert(output, output_type)
+
+    def transform(self, text, function, chunk_size=None, output_type=None):
+        """Replaces the indices of text with function(indices, position)
+
+        position is the number of symbols of text before the chunk. With a
+        chunk_size, the text is read twice, first to size the result and
+        then to fill it, so that no full size temporary is allocated.
+
+        text : string, bytearray or memoryview
+        function : function
+        chunk_size : int, None for the whole text at once
+        output_type : str | bytearray | memoryview, defaults to type(text)
+        """
+        output_type = output_type or type(text)
+        if chunk_size is None:
+            return self.decode(function(self.encode(text), 0), output_type)
+
+        def chunks():
+            """Yields the transformed indices of every chunk"""
+            position = 0
+            for indices in self.encode_chunks(text, chunk_size):
+                yield function(indices, position)
+                position += len(indices)
+        length = sum([len(indices)
+                      for indices in self.encode_chunks(text, chunk_size)])
+        return self.decode_chunks(chunks(), length, output_type)
+
+    def normalize(self, text):
+        """Keeps only the characters of text that belong to the alphabet
+
+        The result has the same type as text.
+
+        text : string, bytearray or memoryview
+        """
+        if not utils.is_text(text):
+            raise AlphabetError('Can only normalize strings or bytes.')
+        if type(text) is memoryview:
+            return self.decode(self.encode(text), memoryview)
+        return text.translate(self.translation, self.deletions)
+
+
+UPPERCASE = Alphabet(string.ascii_uppercase, fold_case=True)
+ALPHANUMERIC = Alphabet(string.ascii_uppercase + string.digits,
+                        fold_case=True)
+LATIN1 = Alphabet(''.join([chr(code) for code in range(256)]))
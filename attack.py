@@ -0,0 +1,398 @@
+"""Dictionary attacks for the PyCiphers library
+
+read_words(wordlist):
+    Yields the words of a wordlist, one per line
+
+    wordlist : path of a file, or iterable of strings
+
+vigenere_key(word[, alphabet]):
+    Shortest Vigenere password equivalent to word
+
+    word : string, unicode, bytearray or memoryview
+    alphabet : Alphabet
+
+playfair_key(word):
+    Shortest Playfair password that generates the same grid as word
+
+    word : string, unicode, bytearray or memoryview
+
+decrypt_vigenere_batch(text, keys[, alphabet]):
+    Decrypts the letter indices of text with every key at once
+
+    text : array of letter indices
+    keys : list of normalized passwords, all of the same length
+    alphabet : Alphabet
+
+decrypt_playfair_batch(first, second, keys):
+    Decrypts the digraphs (first, second) with every key at once
+
+    first, second : arrays of letter indices
+    keys : list of passwords, from playfair_key
+
+attack_vigenere(text, wordlist[, top, prefix, processes, batch_size,
+                alphabet]):
+    Tries every password of the wordlist on text encrypted with the
+    Vigenere cipher and returns the top candidates
+
+attack_playfair(text, wordlist[, top, prefix, processes, batch_size,
+                double_padding, end_padding, alternate_end_padding]):
+    Tries every password of the wordlist on text encrypted with the
+    Playfair cipher and returns the top candidates
+
+    text : string, bytearray or memoryview
+    wordlist : path of a file, or iterable of strings
+    top : int, number of candidates to return
+    prefix : int, number of letters the passwords are first scored on
+    processes : int, size of the process pool, 1 to stay in this process
+    batch_size : int, passwords sent to a process at a time
+
+    Candidates are (score, password, plain text) tuples, best first.
+    The score is the average log-probability of a letter of the plain text
+    under the English letter frequencies. Passwords are deduplicated,
+    remembering 8 bytes per distinct password, and returned in their
+    shortest equivalent form.
+"""
+
+
+import collections
+import hashlib
+import heapq
+import itertools
+import multiprocessing
+import numpy as np
+import utils
+import Playfair
+import Vigenere
+from alphabet import Alphabet, UPPERCASE
+
+
+ENGLISH = {
+    'A': 8.167, 'B': 1.492, 'C': 2.782, 'D': 4.253, 'E': 12.702,
+    'F': 2.228, 'G': 2.015, 'H': 6.094, 'I': 6.966, 'J': 0.153,
+    'K': 0.772, 'L': 4.025, 'M': 2.406, 'N': 6.749, 'O': 7.507,
+    'P': 1.929, 'Q': 0.095, 'R': 5.987, 'S': 6.327, 'T': 9.056,
+    'U': 2.758, 'V': 0.978, 'W': 2.360, 'X': 0.150, 'Y': 1.974,
+    'Z': 0.074}
+
+# keys of the wordlist deduplicated at a time
+DIGEST_BLOCK = 4096
+# state shared by the batches of an attack, set up once in every pool worker
+_STATE = {}
+
+
+class AttackError(Exception):
+    """Attack Exception Class"""
+    def __init__(self, message):
+        super(AttackError, self).__init__(message)
+        print message
+
+
+def log_frequencies(alphabet):
+    """Log-probability of each symbol of the alphabet in English text
+
+    alphabet : Alphabet
+    """
+    frequencies = np.array([ENGLISH.get(symbol.upper(), 0.01)
+                            for symbol in alphabet.symbols])
+    return np.log(frequencies / frequencies.sum())
+
+
+def read_words(wordlist):
+    """Yields the words of a wordlist, one per line
+
+    wordlist : path of a file, or iterable of strings
+    """
+    if not isinstance(wordlist, basestring):
+        for word in wordlist:
+            yield word
+        return
+    with open(wordlist, 'rb') as words:
+        for word in words:
+            yield word.rstrip('\r\n')
+
+
+def _as_word(word):
+    """Returns word as a string, encoding unicode words in UTF-8"""
+    if isinstance(word, unicode):
+        return word.encode('utf-8')
+    if type(word) is memoryview:
+        return word.tobytes()
+    if not utils.is_text(word):
+        raise AttackError('Words must be strings, unicode or bytes.')
+    return str(word)
+
+
+def vigenere_key(word, alphabet=UPPERCASE):
+    """Shortest Vigenere password equivalent to word
+
+    A password made of repetitions of a shorter one encrypts the same.
+
+    word : string, unicode, bytearray or memoryview
+    alphabet : Alphabet
+    """
+    key = alphabet.normalize(_as_word(word))
+    if not key:
+        return key
+    return key[:(key + key).find(key, 1)]
+
+
+def playfair_key(word):
+    """Shortest Playfair password that generates the same grid as word
+
+    Only the first appearance of each letter matters, and trailing letters
+    that the rest of the alphabet would place anyway can be dropped.
+
+    word : string, unicode, bytearray or memoryview
+    """
+    seen = set()
+    key = ''.join([letter for letter in
+                   Playfair.ALPHABET.normalize(_as_word(word))
+                   if not (letter in seen or seen.add(letter))])
+    rest = Playfair.ALPHABET.symbols.translate(None, key)
+    # the last letter is placed anyway if it comes before all the others
+    while key and (not rest or key[-1] < rest[0]):
+        key, rest = key[:-1], key[-1] + rest
+    return key
+
+
+def _digests(keys):
+    """First 8 bytes of the MD5 digest of each key, as an array"""
+    return np.frombuffer(''.join([hashlib.md5(key).digest()[:8]
+                                  for key in keys]), np.uint64)
+
+
+def _unique_keys(words, canonical, block_size=DIGEST_BLOCK):
+    """Yields the distinct keys of words, skipping invalid ones (None)
+
+    Keys seen so far are remembered by their 8 byte digests only, in a few
+    sorted arrays of decreasing size that are merged as they grow, so that
+    wordlists of tens of millions of words stay within 8 bytes per distinct
+    key. Two distinct keys with the same digest, about one chance in 2^64
+    per pair, would only be tried once.
+    """
+    seen = []
+    words = iter(words)
+    while True:
+        block = list(itertools.islice(itertools.imap(canonical, words),
+                                      block_size))
+        if not block:
+            return
+        keys = [key for key in block if key is not None]
+        if not keys:
+            continue
+        digests = _digests(keys)
+        # the first appearance of each digest in the block, in order
+        firsts = np.sort(np.unique(digests, return_index=True)[1])
+        new = np.ones(len(firsts), bool)
+        for level in seen:
+            positions = np.minimum(np.searchsorted(level, digests[firsts]),
+                                   len(level) - 1)
+            new &= level[positions] != digests[firsts]
+        firsts = firsts[new]
+        for index in firsts:
+            yield keys[index]
+
+        if not len(firsts):
+            continue
+        seen.append(np.sort(digests[firsts]))
+        while len(seen) > 1 and len(seen[-2]) <= 2 * len(seen[-1]):
+            last = seen.pop()
+            seen[-1] = np.sort(np.concatenate([seen[-1], last]))
+
+
+def _batches(keys, batch_size):
+    """Groups keys into lists of batch_size"""
+    batch = []
+    for key in keys:
+        batch.append(key)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _initialize(state):
+    """Sets up the state of an attack in a pool worker"""
+    _STATE.clear()
+    _STATE.update(state)
+
+
+def _score_in_worker(score, keys):
+    """Scores a batch in a pool worker, against the state of its attack"""
+    return score(keys, _STATE)
+
+
+def decrypt_vigenere_batch(text, keys, alphabet=UPPERCASE):
+    """Decrypts the indices of text with every key at once
+
+    text : array of letter indices
+    keys : list of normalized passwords, all of the same length
+    alphabet : Alphabet
+    """
+    passwords = alphabet.encode(''.join(keys)).reshape(len(keys), -1)
+    return (text - passwords[:, np.arange(len(text)) % passwords.shape[1]]) \
+        % alphabet.size
+
+
+def decrypt_playfair_batch(first, second, keys):
+    """Decrypts the digraphs (first, second) with every key at once
+
+    Returns the first and second letters of the digraphs, one row per key.
+
+    first, second : arrays of letter indices, from Playfair.pad_digraphs
+    keys : list of passwords, from playfair_key
+    """
+    symbols = Playfair.ALPHABET.symbols
+    orders = Playfair.ALPHABET.encode(''.join(
+        [key + symbols.translate(None, key) for key in keys])).reshape(-1, 25)
+    return Playfair.shift_digraphs(orders, first, second, -1)
+
+
+def _score_vigenere(keys, state):
+    """Scores a batch of Vigenere passwords on the prefix"""
+    by_length = collections.defaultdict(list)
+    for key in keys:
+        by_length[len(key)].append(key)
+
+    scores = []
+    for group in by_length.itervalues():
+        plain = decrypt_vigenere_batch(state['text'], group,
+                                       state['alphabet'])
+        scores.extend(zip(state['log_frequencies'][plain].mean(1).tolist(),
+                          group))
+    return heapq.nlargest(state['keep'], scores)
+
+
+def _score_playfair(keys, state):
+    """Scores a batch of Playfair passwords on the prefix"""
+    first, second = decrypt_playfair_batch(state['first'], state['second'],
+                                           keys)
+    log_freq = state['log_frequencies']
+    scores = (log_freq[first] + log_freq[second]).mean(1) / 2
+    return heapq.nlargest(state['keep'], zip(scores.tolist(), keys))
+
+
+def _attack(keys, score, state, processes, batch_size):
+    """Scores all keys in batches and returns the best state['keep']
+
+    At most two batches per process are in flight, so that the wordlist is
+    never read much further than it is scored. The state is passed to the
+    score function directly in this process, and only set up globally in
+    the pool workers, so that attacks can run in several threads at once.
+    """
+    best = []
+    if processes == 1:
+        for batch in _batches(keys, batch_size):
+            best = heapq.nlargest(state['keep'], best + score(batch, state))
+        return best
+
+    processes = processes or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(processes, _initialize, (state,))
+    try:
+        pending = collections.deque()
+        for batch in _batches(keys, batch_size):
+            pending.append(pool.apply_async(_score_in_worker,
+                                            (score, batch)))
+            if len(pending) >= 2 * processes:
+                best = heapq.nlargest(state['keep'],
+                                      best + pending.popleft().get())
+        while pending:
+            best = heapq.nlargest(state['keep'],
+                                  best + pending.popleft().get())
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    return best
+
+
+def _check_arguments(text, top, prefix, processes, batch_size):
+    """Makes sure the arguments of an attack are valid"""
+    if not utils.is_text(text):
+        raise AttackError('Can only attack strings or bytes.')
+    for name, value in [('top', top), ('prefix', prefix),
+                        ('batch_size', batch_size)]:
+        if type(value) is not int or value < 1:
+            raise AttackError(name + ' must be a positive int.')
+    if processes is not None and (type(processes) is not int or
+                                  processes < 1):
+        raise AttackError('processes must be a positive int or None.')
+
+
+def attack_vigenere(text, wordlist, top=10, prefix=200, processes=None,
+                    batch_size=5000, alphabet=UPPERCASE):
+    """Tries every password of the wordlist on Vigenere encrypted text
+
+    Every distinct password is scored on the first prefix letters, and the
+    best 10 * top are decrypted in full to pick the top candidates.
+
+    text : string, bytearray or memoryview
+    wordlist : path of a file, or iterable of strings
+    top : int
+    prefix : int
+    processes : int
+    batch_size : int
+    alphabet : Alphabet
+    """
+    _check_arguments(text, top, prefix, processes, batch_size)
+    if not isinstance(alphabet, Alphabet):
+        raise AttackError('alphabet must be an Alphabet.')
+
+    log_freq = log_frequencies(alphabet)
+    state = {'alphabet': alphabet, 'log_frequencies': log_freq,
+             'text': alphabet.encode(text)[:prefix], 'keep': 10 * top}
+    if not len(state['text']):
+        raise AttackError('text must contain symbols of the alphabet.')
+    keys = _unique_keys(read_words(wordlist),
+                        lambda word: vigenere_key(word, alphabet) or None)
+    candidates = []
+    for _, key in _attack(keys, _score_vigenere, state, processes,
+                          batch_size):
+        plain = Vigenere.decrypt(text, key, alphabet)
+        score = log_freq[alphabet.encode(plain)].mean() if len(plain) else 0.
+        candidates.append((score, key, plain))
+    return heapq.nlargest(top, candidates)
+
+
+def attack_playfair(text, wordlist, top=10, prefix=200, processes=None,
+                    batch_size=5000, double_padding='X', end_padding='Z',
+                    alternate_end_padding='X'):
+    """Tries every password of the wordlist on Playfair encrypted text
+
+    Passwords that generate the same grid are only tried once. Every
+    distinct grid is scored on the first prefix letters, and the best
+    10 * top are decrypted in full to pick the top candidates.
+
+    text : string, bytearray or memoryview
+    wordlist : path of a file, or iterable of strings
+    top : int
+    prefix : int
+    processes : int
+    batch_size : int
+    double_padding : character
+    end_padding : character
+    alternate_end_padding : character
+    """
+    _check_arguments(text, top, prefix, processes, batch_size)
+
+    log_freq = log_frequencies(Playfair.ALPHABET)
+    letters = Playfair.pad_digraphs(
+        Playfair.ALPHABET.encode(text), double_padding, end_padding,
+        alternate_end_padding)[:prefix + prefix % 2]
+    if not len(letters):
+        raise AttackError('text must contain letters.')
+    state = {'first': letters[0::2], 'second': letters[1::2],
+             'log_frequencies': log_freq, 'keep': 10 * top}
+    keys = _unique_keys(read_words(wordlist), playfair_key)
+    candidates = []
+    for _, key in _attack(keys, _score_playfair, state, processes,
+                          batch_size):
+        plain = Playfair.decrypt(text, key, double_padding, end_padding,
+                                 alternate_end_padding)
+        score = log_freq[Playfair.ALPHABET.encode(plain)].mean() \
+            if len(plain) else 0.
+        candidates.append((score, key, plain))
+    return heapq.nlargest(top, candidates)
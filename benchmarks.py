@@ -0,0 +1,179 @@
+"""Memory benchmarks for the PyCiphers library
+
+Runs every cipher on texts of increasing size, each run in a fresh process,
+and reports the peak memory allocated on top of the text itself. Runs in
+low memory mode are checked to stay within max_factor times the size of
+their output (plus a fixed slack for the interpreter and chunk buffers).
+
+    python benchmarks.py [--sizes 1M,16M,64M] [--ciphers Caesar,...]
+                         [--modes default,low_memory] [--max-factor 4]
+
+Larger texts are given the same way, e.g. --sizes 256M,1G. Peak memory is
+read from the resource module, which is not available on Windows.
+
+generate_text(path, size[, seed]):
+    Writes size random bytes of letters and spaces to path
+
+measure(cipher, size, low_memory, path):
+    Runs cipher on the first size bytes of path in a new process and
+    returns the peak memory in bytes, the length of the output, and the
+    time taken
+
+check(results, max_factor[, slack]):
+    Returns the low memory results whose peak memory is out of bounds
+"""
+
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# cipher : (function, arguments after the text)
+CIPHERS = {
+    'Caesar': ('Caesar.encrypt', (7, 5)),
+    'Vigenere': ('Vigenere.encrypt', ('lemon',)),
+    'OneTimePad': ('OneTimePad.encrypt', (None,)),
+    'Playfair': ('Playfair.encrypt', ('monarchy',)),
+    'Skytale': ('Skytale.encrypt', (7,)),
+}
+UNITS = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+# memory allowed on top of max_factor * output, for chunks and the interpreter
+SLACK = 8 << 20
+
+
+def parse_size(size):
+    """Parses sizes such as 512, 16M or 1G into bytes"""
+    size = size.strip().upper()
+    if size[-1:] in UNITS:
+        return int(size[:-1]) * UNITS[size[-1]]
+    return int(size)
+
+
+def generate_text(path, size, seed=0):
+    """Writes size random bytes of letters and spaces to path
+
+    path : string
+    size : int
+    seed : int
+    """
+    characters = np.frombuffer('ABCDEFGHIJKLMNOPQRSTUVWXYZ    ', np.uint8)
+    state = np.random.RandomState(seed)
+    with open(path, 'wb') as text_file:
+        for start in xrange(0, size, 1 << 20):
+            chunk = min(1 << 20, size - start)
+            text_file.write(characters[state.randint(
+                0, len(characters), chunk)].tostring())
+
+
+def peak_memory():
+    """Peak resident memory of this process, in bytes"""
+    if resource is None:
+        raise OSError('Peak memory can not be measured on this platform.')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes everywhere but on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run(cipher, size, low_memory, path):
+    """Runs cipher on the first size bytes of path, in this process
+
+    The text is read with a single allocation of its size, so the peak
+    memory measured before the run is the baseline of the process.
+    """
+    module_name, function_name = CIPHERS[cipher][0].split('.')
+    function = getattr(__import__(module_name), function_name)
+    with open(path, 'rb') as text_file:
+        text = text_file.read(size)
+    arguments = [text if argument is None else argument
+                 for argument in CIPHERS[cipher][1]]
+
+    baseline = peak_memory()
+    start = time.time()
+    output = function(text, *arguments, low_memory=low_memory)
+    seconds = time.time() - start
+    return {'cipher': cipher, 'size': size, 'low_memory': low_memory,
+            'peak': max(peak_memory() - baseline, 0), 'output': len(output),
+            'seconds': seconds}
+
+
+def measure(cipher, size, low_memory, path):
+    """Runs cipher on the first size bytes of path in a new process
+
+    cipher : name of a cipher in CIPHERS
+    size : int
+    low_memory : bool
+    path : string, at least size bytes long
+    """
+    output = subprocess.check_output([
+        sys.executable, os.path.abspath(__file__), '--run', cipher,
+        str(size), str(int(low_memory)), path])
+    return json.loads(output)
+
+
+def check(results, max_factor, slack=SLACK):
+    """Returns the low memory results whose peak memory is out of bounds
+
+    results : list of results of measure
+    max_factor : float
+    slack : int
+    """
+    return [result for result in results if result['low_memory'] and
+            result['peak'] > max_factor * result['output'] + slack]
+
+
+def main():
+    """Runs the benchmarks from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', default='1M,16M,64M')
+    parser.add_argument('--ciphers', default=','.join(sorted(CIPHERS)))
+    parser.add_argument('--modes', default='default,low_memory')
+    parser.add_argument('--max-factor', type=float, default=4.)
+    parser.add_argument('--run', nargs=4, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.run:
+        cipher, size, low_memory, path = arguments.run
+        print json.dumps(run(cipher, int(size), low_memory == '1', path))
+        return 0
+
+    sizes = [parse_size(size) for size in arguments.sizes.split(',')]
+    modes = [mode == 'low_memory' for mode in arguments.modes.split(',')]
+    handle, path = tempfile.mkstemp()
+    os.close(handle)
+    results = []
+    try:
+        generate_text(path, max(sizes))
+        print '%-10s %-10s %12s %12s %8s %8s' % (
+            'cipher', 'mode', 'size', 'peak', 'x output', 'seconds')
+        for cipher in arguments.ciphers.split(','):
+            for size in sizes:
+                for low_memory in modes:
+                    result = measure(cipher, size, low_memory, path)
+                    results.append(result)
+                    print '%-10s %-10s %12d %12d %8.2f %8.2f' % (
+                        cipher, 'low_memory' if low_memory else 'default',
+                        size, result['peak'],
+                        result['peak'] / float(max(result['output'], 1)),
+                        result['seconds'])
+    finally:
+        os.remove(path)
+
+    failures = check(results, arguments.max_factor)
+    for result in failures:
+        print 'FAILED: %(cipher)s on %(size)d bytes peaked at %(peak)d bytes' \
+            % result
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
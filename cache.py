@@ -0,0 +1,224 @@
+"""Result cache for the PyCiphers library
+
+ResultCache([max_bytes]):
+    Thread-safe least recently used cache of cipher results
+
+    The cache holds texts and results of at most max_bytes bytes in total,
+    evicting the least recently used results to make room. It counts its
+    hits, misses and evictions.
+
+    max_bytes : int
+
+memoize(function[, cache]):
+    Wraps a cipher function so that its results are cached
+
+    The wrapper takes an extra `cache` keyword argument, a ResultCache to
+    use for that call, or False to skip caching for that call.
+    One-Time Pad functions can not be memoized, so that a pad is never
+    reused from the cache.
+
+    function : cipher function, e.g. Caesar.encrypt
+    cache : ResultCache, defaults to DEFAULT
+
+encrypt(cipher, text, *args[, cache]):
+    Encrypts text with cipher, through the cache
+
+    The One-Time Pad cipher is always called directly.
+
+    cipher : cipher module, e.g. Caesar
+    text : string, bytearray or memoryview
+    cache : ResultCache | False
+
+decrypt(cipher, text, *args[, cache]):
+    Decrypts text with cipher, through the cache
+
+    cipher : cipher module, e.g. Caesar
+    text : string, bytearray or memoryview
+    cache : ResultCache | False
+
+DEFAULT:
+    The ResultCache used when no other is given
+"""
+
+
+import collections
+import functools
+import threading
+import utils
+import OneTimePad
+
+
+# bytes counted for each cached result on top of its texts
+ENTRY_OVERHEAD = 256
+
+
+class CacheError(Exception):
+    """Cache Exception Class"""
+    def __init__(self, message):
+        super(CacheError, self).__init__(message)
+        print message
+
+
+class ResultCache(object):
+    """Thread-safe least recently used cache of cipher results
+
+    max_bytes : total size of the cached texts and results
+    size : current size of the cached texts and results
+    hits, misses, evictions : int
+    """
+    def __init__(self, max_bytes=64 << 20):
+        if type(max_bytes) is not int or max_bytes < 0:
+            raise CacheError('max_bytes must be a non negative int.')
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the result cached under key, or None
+
+        key : hashable
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, result, size):
+        """Caches result under key, evicting old results to make room
+
+        key : hashable
+        result : string
+        size : int, bytes accounted for the entry
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            while self._entries and self.size + size > self.max_bytes:
+                self.size -= self._entries.popitem(last=False)[1][1]
+                self.evictions += 1
+            self._entries[key] = (result, size)
+            self.size += size
+
+    def clear(self):
+        """Removes all cached results and resets the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = self.evictions = 0
+
+
+DEFAULT = ResultCache()
+
+
+def _is_one_time_pad(module_name):
+    """Checks if module_name names the One-Time Pad cipher module"""
+    return module_name.rsplit('.', 1)[-1] == OneTimePad.__name__
+
+
+def _as_bytes(text):
+    """Returns the bytes of a string, bytearray or memoryview as a string"""
+    if type(text) is memoryview:
+        return text.tobytes()
+    return bytes(text)
+
+
+def _freeze(arg):
+    """Hashable form of an argument, keeping its type
+
+    The type is kept so that a hit is only returned for arguments the
+    cipher would have accepted, e.g. 'X' but not bytearray('X').
+    """
+    return (type(arg), _as_bytes(arg) if utils.is_text(arg) else arg)
+
+
+def _call(function, text, args, kwargs, cache):
+    """Calls function(text, *args, **kwargs) through cache"""
+    if cache is False or not utils.is_text(text):
+        return function(text, *args, **kwargs)
+    if not isinstance(cache, ResultCache):
+        raise CacheError('cache must be a ResultCache or False.')
+
+    frozen = tuple([_freeze(arg) for arg in args])
+    frozen_kwargs = tuple(sorted([(name, _freeze(arg))
+                                  for name, arg in kwargs.iteritems()]))
+    key = (function.__module__, function.__name__, _as_bytes(text),
+           frozen, frozen_kwargs)
+    try:
+        hash(key)
+    except TypeError:
+        return function(text, *args, **kwargs)
+
+    result = cache.get(key)
+    if result is None:
+        result = function(text, *args, **kwargs)
+        arguments = list(frozen) + [arg for _, arg in frozen_kwargs]
+        size = len(key[2]) + len(result) + ENTRY_OVERHEAD + sum(
+            [len(value) for arg_type, value in arguments
+             if arg_type in utils.TEXT_TYPES])
+        cache.put(key, _as_bytes(result), size)
+        return result
+    if type(text) is bytearray:
+        return bytearray(result)
+    if type(text) is memoryview:
+        return memoryview(result)
+    return result
+
+
+def memoize(function, cache=None):
+    """Wraps a cipher function so that its results are cached
+
+    function : cipher function, e.g. Caesar.encrypt
+    cache : ResultCache, defaults to DEFAULT
+    """
+    if _is_one_time_pad(function.__module__):
+        raise CacheError('One-Time Pad results must never be cached.')
+
+    @functools.wraps(function)
+    def wrapper(text, *args, **kwargs):
+        """Calls the cipher function through the cache"""
+        call_cache = kwargs.pop('cache', None)
+        if call_cache is None:
+            call_cache = DEFAULT if cache is None else cache
+        return _call(function, text, args, kwargs, call_cache)
+    return wrapper
+
+
+def encrypt(cipher, text, *args, **kwargs):
+    """Encrypts text with cipher, through the cache
+
+    cipher : cipher module, e.g. Caesar
+    text : string, bytearray or memoryview
+    cache : ResultCache | False
+    """
+    cache = kwargs.pop('cache', None)
+    if _is_one_time_pad(cipher.__name__):
+        return cipher.encrypt(text, *args, **kwargs)
+    return _call(cipher.encrypt, text, args, kwargs,
+                 DEFAULT if cache is None else cache)
+
+
+def decrypt(cipher, text, *args, **kwargs):
+    """Decrypts text with cipher, through the cache
+
+    cipher : cipher module, e.g. Caesar
+    text : string, bytearray or memoryview
+    cache : ResultCache | False
+    """
+    cache = kwargs.pop('cache', None)
+    if _is_one_time_pad(cipher.__name__):
+        return cipher.decrypt(text, *args, **kwargs)
+    return _call(cipher.decrypt, text, args, kwargs,
+                 DEFAULT if cache is None else cache)
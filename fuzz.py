@@ -0,0 +1,617 @@
+"""Differential fuzzing of the PyCiphers library
+
+Generates random texts and keys, runs them through an oracle and through
+the fast paths of the ciphers, and reports the first case on which they
+differ, minimized. A case differs when the outputs differ, or when only
+one of them raises. About one case in eight has an argument that the
+cipher must reject.
+
+The oracle is the reference implementation on the default alphabet. Cases
+on the other alphabets of Caesar, Vigenere and One-Time Pad have no
+reference, so the default path on strings is their oracle instead. Inputs
+the reference raises Unsupported on are skipped.
+
+    python fuzz.py [--cases 100000] [--seed 0] [--processes 4]
+                   [--ciphers Caesar,...] [--chunk-size 5]
+                   [--paths-per-case 2] [--parallel-every 10000]
+
+PATHS:
+    The fast paths cases are run through, by name
+
+generate_block(seed, block, kinds):
+    Returns the BLOCK cases of a block, as (kind, arguments) pairs
+
+    seed : non negative int
+    block : int
+    kinds : list of (cipher, direction, alphabet) kinds of cases
+
+run_case(kind, arguments[, paths]):
+    Runs one case through its oracle and the paths and returns the first
+    divergence, or None
+
+minimize(divergence):
+    Shrinks the arguments of a divergence while it keeps diverging
+
+fuzz(cases[, seed, ciphers, processes, chunk_size, paths_per_case,
+     parallel_every]):
+    Runs cases random cases and returns the first divergence, minimized,
+    or None
+"""
+
+
+import argparse
+import contextlib
+import fractions
+import multiprocessing
+import os
+import random
+import sys
+import numpy as np
+import alphabet
+import attack
+import cache
+import reference
+import utils
+import Caesar
+import Vigenere
+import OneTimePad
+import Playfair
+import Skytale
+from alphabet import UPPERCASE
+
+
+MODULES = {'Caesar': Caesar, 'Vigenere': Vigenere, 'OneTimePad': OneTimePad,
+           'Playfair': Playfair, 'Skytale': Skytale}
+# alphabets of the cases without a reference
+ALPHABETS = {
+    'ALPHANUMERIC': alphabet.ALPHANUMERIC,
+    'LATIN1': alphabet.LATIN1,
+    'PLAYFAIR': Playfair.ALPHABET,
+    'HEX': alphabet.Alphabet('0123456789ABCDEF', fold_case=True,
+                             aliases={'O': '0', 'I': '1'}),
+}
+# a kind of case is (cipher, direction, alphabet), where alphabet is None
+# for the cases on the default alphabet, checked against the reference
+KINDS = [(cipher, direction, None) for cipher in sorted(MODULES)
+         for direction in ('encrypt', 'decrypt')] + \
+        [(cipher, direction, 'other')
+         for cipher in ('Caesar', 'OneTimePad', 'Vigenere')
+         for direction in ('encrypt', 'decrypt')]
+
+# cases generated together, from the seed and the index of their block
+BLOCK = 1000
+# characters the texts of a block are sliced from
+TAPE = 1 << 16
+# characters of the random texts, weighted towards the letters
+CHARACTERS = ('ABCDEFGHIJKLMNOPQRSTUVWXYZ' * 3 + 'abcdefghijklmnopqrstuvwxyz' +
+              'JjXxZzIi' + '     ,.!?-0123456789' + '\x00\t\n\xe9\xff')
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+FACTORS = [factor for factor in range(-51, 52)
+           if factor % 2 and factor % 13]
+INVALID = 1. / 8
+# arguments of the wrong type, for any argument
+WRONG_TYPES = [None, 5, 2.5, u'AB', ['A']]
+# types passwords and keys may also be given as
+KEY_TYPES = [str] * 18 + [bytearray, memoryview]
+
+_CACHE = cache.ResultCache(1 << 20)
+
+
+class FuzzError(Exception):
+    """Fuzz Exception Class"""
+    def __init__(self, message):
+        super(FuzzError, self).__init__(message)
+        print message
+
+
+def _tape(numbers, characters):
+    """TAPE random characters, with runs of double letters"""
+    codes = np.frombuffer(characters, np.uint8)[
+        numbers.randint(0, len(characters), TAPE)]
+    # a fifth of the characters repeat the one before
+    sources = np.arange(TAPE)
+    sources[numbers.random_sample(TAPE) < 0.2] = 0
+    return codes[np.maximum.accumulate(sources)].tostring()
+
+
+def _text(state, tape, length):
+    """A random slice of length characters of tape"""
+    start = int(state.random() * (len(tape) - length))
+    return tape[start:start + length]
+
+
+def _length(state):
+    """Mostly short lengths, sometimes long enough to span many chunks"""
+    if state.random() < 0.05:
+        return int(state.random() * 401)
+    return int(state.random() * 41)
+
+
+def _letterless(state, text, invalid):
+    """text without its letters, for some of the invalid cases
+
+    Passwords and keys without letters are only rejected when the text has
+    a letter, so they are often paired with texts without any.
+    """
+    if invalid and type(text) is str and state.random() < 0.3:
+        return text.translate(None, LETTERS + LETTERS.lower())
+    return text
+
+
+def _letters(state, length):
+    """length random capital letters"""
+    return ''.join([state.choice(LETTERS) for _ in xrange(length)])
+
+
+def generate_case(state, tapes, kind):
+    """Returns random arguments for the cipher function of kind
+
+    state : random.Random
+    tapes : (characters, letters) to slice texts from
+    kind : (cipher, direction, alphabet)
+    """
+    cipher, direction, other = kind
+    text = _text(state, tapes[0], _length(state))
+    invalid = state.random() < INVALID
+    if invalid and state.random() < 0.2:
+        invalid, text = False, state.choice(WRONG_TYPES)
+    if other:
+        return _alphabet_case(state, tapes, cipher, text, invalid)
+
+    if cipher == 'Caesar':
+        offset, factor = state.randint(-60, 60), state.choice(FACTORS)
+        if state.random() < 0.05:
+            offset += state.choice([-1, 1]) * 10 ** 20
+            factor += 26 * 3 ** 41
+        if invalid and state.random() < 0.3:
+            offset = state.choice([3.0] + WRONG_TYPES)
+        elif invalid:
+            factor = state.choice([0, 2, 13, -26, 39, 3.0] + WRONG_TYPES)
+        return [text, offset, factor]
+    if cipher == 'Vigenere':
+        text = _letterless(state, text, invalid)
+        password = state.choice(KEY_TYPES)(
+            _text(state, tapes[0], state.randint(0, 12)) +
+            state.choice(LETTERS))
+        if invalid:
+            password = state.choice(['', '42 !'] + WRONG_TYPES)
+        return [text, password]
+    if cipher == 'OneTimePad':
+        text = _letterless(state, text, invalid)
+        size = len(text) if type(text) is str else 10
+        key = _text(state, tapes[0], size + state.randint(0, 5)) + \
+            state.choice(LETTERS)
+        if invalid:
+            key = state.choice([key[:size - 1], '1' * (size + 1)] +
+                               WRONG_TYPES)
+        return [text, state.choice(KEY_TYPES)(key) if type(key) is str
+                else key]
+    if cipher == 'Playfair':
+        arguments = [text, state.choice(KEY_TYPES)(
+            _text(state, tapes[0], state.randint(0, 15)))] + \
+            [state.choice('XZQIJxzqij' + LETTERS) for _ in range(3)]
+        if invalid:
+            arguments[state.randint(1, 4)] = state.choice(
+                ['', 'XY', '1', ' ', bytearray('X')] + WRONG_TYPES)
+        return arguments
+
+    size = state.randint(1, 8)
+    if direction == 'decrypt' and type(text) is str:
+        # texts that fill the whole grid, with a few other characters
+        text = _text(state, tapes[1], size * state.randint(0, 12))
+        for _ in range(state.randint(0, 3)):
+            position = state.randint(0, len(text))
+            text = text[:position] + state.choice(' ,.1') + text[position:]
+    if type(text) is str:
+        text += ' ' * (size + 1 - len(text))
+    if invalid:
+        size = state.choice([0, -1, len(text), len(text) + 3, '3'] +
+                            WRONG_TYPES)
+    return [text, size]
+
+
+def _alphabet_case(state, tapes, cipher, text, invalid):
+    """Random arguments for a cipher over one of ALPHABETS"""
+    symbols = ALPHABETS[state.choice(sorted(ALPHABETS))]
+    if cipher == 'Caesar':
+        factor = state.choice([factor for factor in range(1, symbols.size)
+                               if fractions.gcd(factor, symbols.size) == 1])
+        if invalid:
+            factor = state.choice([0, symbols.size, 2 * symbols.size])
+        return [text, state.randint(-300, 300), factor, symbols]
+    size = len(text) if type(text) is str else 10
+    if cipher == 'Vigenere':
+        size = state.randint(0, 12)
+    key = _text(state, tapes[0], size + state.randint(0, 5)) + \
+        state.choice(symbols.symbols)
+    if invalid:
+        key = state.choice(['', None])
+    return [text, key, symbols]
+
+
+def _function(kind):
+    """The fast cipher function of kind"""
+    return getattr(MODULES[kind[0]], kind[1])
+
+
+def _typed(text_type, low_memory=False):
+    """Path through text_type inputs, checking the type of the output"""
+    def path(kind, arguments):
+        """Runs the function on a text of another type"""
+        text = arguments[0]
+        if type(text) is str:
+            text = text_type(text)
+        output = _function(kind)(text, *arguments[1:], low_memory=low_memory)
+        if type(output) is not text_type:
+            return '<' + type(output).__name__ + ' returned>'
+        return memoryview(output).tobytes()
+    return path
+
+
+def _plain(kind, arguments):
+    """The default path"""
+    return _function(kind)(*arguments)
+
+
+def _low_memory(kind, arguments):
+    """The chunked path"""
+    return _function(kind)(*arguments, low_memory=True)
+
+
+def _cached(kind, arguments):
+    """Calls through the result cache twice, so that one call may hit"""
+    call = getattr(cache, kind[1])
+    first = call(MODULES[kind[0]], *arguments, cache=_CACHE)
+    second = call(MODULES[kind[0]], *arguments, cache=_CACHE)
+    return first if first == second else '<' + second + ' on a hit>'
+
+
+def _canonical(kind, arguments):
+    """Calls with the shortest equivalent password"""
+    if kind[0] == 'Vigenere':
+        password = attack.vigenere_key(arguments[1])
+    else:
+        password = attack.playfair_key(arguments[1])
+    return _function(kind)(arguments[0], password, *arguments[2:])
+
+
+def _batched(kind, arguments):
+    """Decrypts with the batched engine of the attacks, among other keys"""
+    decoys = random.Random(len(arguments[1]))
+    if kind[0] == 'Vigenere':
+        key = attack.vigenere_key(arguments[1])
+        keys = [_letters(decoys, len(key)), key, _letters(decoys, len(key))]
+        return UPPERCASE.decode(attack.decrypt_vigenere_batch(
+            UPPERCASE.encode(arguments[0]), keys)[1])
+
+    letters = Playfair.pad_digraphs(Playfair.ALPHABET.encode(arguments[0]),
+                                    *arguments[2:])
+    keys = [attack.playfair_key(_letters(decoys, 10)),
+            attack.playfair_key(arguments[1])]
+    first, second = attack.decrypt_playfair_batch(
+        letters[0::2], letters[1::2], keys)
+    return Playfair.ALPHABET.decode(
+        np.column_stack([first[1], second[1]]).ravel())
+
+
+def _parallel(kind, arguments):
+    """Decrypts with the attack, scoring batches in a process pool"""
+    if not len(UPPERCASE.encode(arguments[0])):
+        return ''  # there is nothing to attack
+    words = [arguments[1], 'decoy', 'other']
+    if kind[0] == 'Vigenere':
+        key = attack.vigenere_key(arguments[1])
+        candidates = attack.attack_vigenere(arguments[0], words, top=3,
+                                            processes=2, batch_size=1)
+    else:
+        key = attack.playfair_key(arguments[1])
+        candidates = attack.attack_playfair(
+            arguments[0], words, top=3, processes=2, batch_size=1,
+            double_padding=arguments[2], end_padding=arguments[3],
+            alternate_end_padding=arguments[4])
+    for _, candidate, plain in candidates:
+        if candidate == key:
+            return plain
+    return '<password not found>'
+
+
+def _everywhere(kind):
+    """Applies to every kind of case"""
+    return True
+
+
+def _is_referenced(kind):
+    """Applies to the cases on the default alphabet"""
+    return kind[2] is None
+
+
+def _has_password(kind):
+    """Applies to the ciphers with a password the attacks shorten"""
+    return kind[2] is None and kind[0] in ('Vigenere', 'Playfair')
+
+
+def _is_attacked(kind):
+    """The attacks only decrypt Vigenere and Playfair"""
+    return _has_password(kind) and kind[1] == 'decrypt'
+
+
+# name : (path, which kinds it applies to, whether it must also reject
+#         what the oracle rejects)
+PATHS = {
+    'plain': (_plain, _is_referenced, True),
+    'bytearray': (_typed(bytearray), _everywhere, True),
+    'memoryview': (_typed(memoryview), _everywhere, True),
+    'low_memory': (_low_memory, _everywhere, True),
+    'low_memory_bytearray': (_typed(bytearray, True), _everywhere, True),
+    'cache': (_cached, _everywhere, True),
+    'canonical': (_canonical, _has_password, False),
+    'batched': (_batched, _is_attacked, False),
+    'parallel': (_parallel, _is_attacked, False),
+}
+# paths sampled on every case, the process pool of the attacks is too slow
+FAST_PATHS = sorted(set(PATHS) - set(['parallel', 'plain']))
+# the fast paths of each kind of case
+_APPLICABLE = dict((kind, [path for path in FAST_PATHS
+                           if PATHS[path][1](kind)]) for kind in KINDS)
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silences the messages the cipher errors print"""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        yield
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def _outcome(function, *arguments):
+    """(raised, output or error) of a call"""
+    try:
+        return False, function(*arguments)
+    except reference.Unsupported:
+        raise
+    except Exception as error:
+        return True, type(error).__name__ + ': ' + str(error)
+
+
+def _oracle(kind, arguments):
+    """Outcome of the reference, or of the default path on other alphabets"""
+    if kind[2] is None:
+        return _outcome(getattr(reference, kind[0].lower() + '_' + kind[1]),
+                        *arguments)
+    return _outcome(_plain, kind, arguments)
+
+
+def _show(outcome):
+    """Readable form of an outcome"""
+    return '<raised ' + outcome[1] + '>' if outcome[0] else outcome[1]
+
+
+def run_case(kind, arguments, paths=('plain',) + tuple(FAST_PATHS)):
+    """Runs one case and returns the first divergence, or None
+
+    kind : (cipher, direction, alphabet)
+    arguments : list, from generate_case
+    paths : names of PATHS
+    """
+    try:
+        expected = _oracle(kind, arguments)
+    except reference.Unsupported:
+        return None
+    for path in paths:
+        function, applies, rejects = PATHS[path]
+        if not applies(kind) or (expected[0] and not rejects):
+            continue
+        actual = _outcome(function, kind, arguments)
+        if actual[0] != expected[0] or (not actual[0] and
+                                        actual[1] != expected[1]):
+            return {'cipher': kind[0], 'direction': kind[1], 'kind': kind,
+                    'path': path, 'arguments': arguments,
+                    'expected': _show(expected), 'actual': _show(actual)}
+    return None
+
+
+def minimize(divergence):
+    """Shrinks the arguments of a divergence while it keeps diverging
+
+    Every string argument is shrunk by removing ever smaller slices of it.
+
+    divergence : dict, from run_case
+    """
+    kind, path = divergence['kind'], divergence['path']
+    arguments = list(divergence['arguments'])
+
+    def diverges(candidate):
+        """Checks that candidate still diverges on the same path"""
+        return run_case(kind, candidate, [path]) is not None
+
+    changed = True
+    while changed:
+        changed = False
+        for position, value in enumerate(arguments):
+            if type(value) is not str or len(value) < 2:
+                continue
+            chunk = len(value) / 2
+            while chunk:
+                start = 0
+                while start < len(arguments[position]):
+                    value = arguments[position]
+                    candidate = list(arguments)
+                    candidate[position] = value[:start] + value[start + chunk:]
+                    if diverges(candidate):
+                        arguments = candidate
+                        changed = True
+                    else:
+                        start += chunk
+                chunk /= 2
+
+    minimized = run_case(kind, arguments, [path])
+    minimized['original'] = divergence['arguments']
+    return minimized
+
+
+def generate_block(seed, block, kinds):
+    """Returns the BLOCK cases of block, as (kind, arguments) pairs
+
+    Every block is generated from the seed and its own index, so that the
+    cases do not depend on how the blocks are split over processes.
+
+    seed : non negative int
+    block : int
+    kinds : list of (cipher, direction, alphabet)
+    """
+    state = random.Random((seed, block))
+    numbers = np.random.RandomState([seed, block])
+    tapes = (_tape(numbers, CHARACTERS), _tape(numbers, LETTERS))
+    return [(kinds[index % len(kinds)],
+             generate_case(state, tapes, kinds[index % len(kinds)]))
+            for index in xrange(block * BLOCK, (block + 1) * BLOCK)]
+
+
+def _sample(kind, index, kinds, paths_per_case):
+    """The paths a case runs through, rotating over the fast paths"""
+    paths = _APPLICABLE[kind]
+    if paths_per_case and paths_per_case < len(paths):
+        start = index / len(kinds) * paths_per_case
+        paths = [paths[(start + offset) % len(paths)]
+                 for offset in range(paths_per_case)]
+    return ['plain'] + paths
+
+
+def _fuzz_block(arguments):
+    """Runs the cases of a block, returns the first divergence or None"""
+    seed, block, cases, kinds, chunk_size, paths_per_case = arguments
+    utils.LOW_MEMORY_CHUNK = chunk_size
+    with _quiet():
+        for index, (kind, case) in enumerate(
+                generate_block(seed, block, kinds), block * BLOCK):
+            if index >= cases:
+                break
+            divergence = run_case(kind, case, _sample(kind, index, kinds,
+                                                      paths_per_case))
+            if divergence is not None:
+                divergence['case'] = index
+                return divergence
+    return None
+
+
+def _fuzz_parallel(seed, cases, kinds, every):
+    """Runs a case through the parallel attacks every every cases"""
+    attacked = [kind for kind in kinds if _is_attacked(kind)]
+    if not every or not attacked:
+        return None
+    with _quiet():
+        for check, start in enumerate(xrange(0, cases, every)):
+            # the first case at or after start of the next attacked kind
+            kind = attacked[check % len(attacked)]
+            index = start + (kinds.index(kind) - start) % len(kinds)
+            if index >= cases:
+                break
+            case = generate_block(seed, index / BLOCK, kinds)[index % BLOCK]
+            divergence = run_case(kind, case[1], ['parallel'])
+            if divergence is not None:
+                divergence['case'] = index
+                return divergence
+    return None
+
+
+def fuzz(cases, seed=0, ciphers=None, processes=1, chunk_size=5,
+         paths_per_case=2, parallel_every=10000):
+    """Runs cases random cases and returns the first divergence, or None
+
+    Every case runs through the default path and paths_per_case of the
+    other fast paths, in turn, or all of them when paths_per_case is 0.
+    The low memory paths run with chunks of chunk_size characters, so that
+    even short texts cross many chunk boundaries. Every
+    parallel_every-th case also runs through the process pool of the
+    attacks, from this process.
+
+    cases : int
+    seed : non negative int
+    ciphers : list of names of MODULES, defaults to all
+    processes : int, size of the process pool the blocks are split over
+    chunk_size : int
+    paths_per_case : int
+    parallel_every : int, 0 to never run the parallel path
+    """
+    ciphers = ciphers or sorted(MODULES)
+    for cipher in ciphers:
+        if cipher not in MODULES:
+            raise FuzzError('Unknown cipher ' + repr(cipher) + '.')
+    if type(seed) is not int or seed < 0:
+        raise FuzzError('seed must be a non negative int.')
+    kinds = [kind for kind in KINDS if kind[0] in ciphers]
+    tasks = [(seed, block, cases, kinds, chunk_size, paths_per_case)
+             for block in xrange(-(-cases // BLOCK))]
+
+    previous_chunk = utils.LOW_MEMORY_CHUNK
+    divergences = []
+    try:
+        if processes == 1:
+            for task in tasks:
+                divergences.append(_fuzz_block(task))
+                if divergences[-1]:
+                    break
+        else:
+            pool = multiprocessing.Pool(processes)
+            try:
+                # blocks come back in order, the first divergence is earliest
+                for divergence in pool.imap(_fuzz_block, tasks):
+                    divergences.append(divergence)
+                    if divergence:
+                        break
+            finally:
+                pool.terminate()
+                pool.join()
+        utils.LOW_MEMORY_CHUNK = chunk_size
+        divergences.append(_fuzz_parallel(seed, cases, kinds,
+                                          parallel_every))
+
+        divergences = [divergence for divergence in divergences if divergence]
+        if not divergences:
+            return None
+        divergence = min(divergences,
+                         key=lambda divergence: divergence['case'])
+        with _quiet():
+            minimized = minimize(divergence)
+    finally:
+        utils.LOW_MEMORY_CHUNK = previous_chunk
+    minimized['case'] = divergence['case']
+    return minimized
+
+
+def main():
+    """Runs the fuzzer from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--cases', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int,
+                        default=multiprocessing.cpu_count())
+    parser.add_argument('--ciphers', default=','.join(sorted(MODULES)))
+    parser.add_argument('--chunk-size', type=int, default=5)
+    parser.add_argument('--paths-per-case', type=int, default=2)
+    parser.add_argument('--parallel-every', type=int, default=10000)
+    arguments = parser.parse_args()
+
+    divergence = fuzz(arguments.cases, arguments.seed,
+                      arguments.ciphers.split(','), arguments.processes,
+                      arguments.chunk_size, arguments.paths_per_case,
+                      arguments.parallel_every)
+    if divergence is None:
+        print 'No divergence in %d cases.' % arguments.cases
+        return 0
+    print 'Divergence in case %d, %s.%s through the %s path' % (
+        divergence['case'], divergence['cipher'], divergence['direction'],
+        divergence['path'])
+    print '  arguments: %r' % (divergence['arguments'],)
+    print '  expected:  %r' % (divergence['expected'],)
+    print '  actual:    %r' % (divergence['actual'],)
+    print '  original:  %r' % (divergence['original'],)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
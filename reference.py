@@ -0,0 +1,241 @@
+"""Reference implementations of the PyCiphers ciphers
+
+Plain Python, letter by letter versions of the ciphers, kept as the oracle
+that the vectorized, chunked and batched implementations are tested
+against. They accept strings, and bytes for passwords and keys like the
+fast implementations, and reject what the original implementations
+rejected, raising ValueError. Inputs on which the original implementations
+were wrong raise Unsupported instead. Passwords without letters are
+rejected as soon as the text has a letter, where the original
+implementations only failed once a letter of the text needed them, and
+factors and offsets that are not ints are always rejected.
+
+caesar_encrypt(text, offset[, factor]), caesar_decrypt(...)
+vigenere_encrypt(text, password), vigenere_decrypt(...)
+onetimepad_encrypt(text, key), onetimepad_decrypt(...)
+playfair_encrypt(text, password[, double_padding, end_padding,
+                 alternate_end_padding]), playfair_decrypt(...)
+skytale_encrypt(text, size), skytale_decrypt(...)
+"""
+
+
+import re
+import utils
+
+
+class Unsupported(ValueError):
+    """Raised on inputs that the original implementations got wrong"""
+
+
+def fix_text(text):
+    """Capitalizes all letters and removes all non letters
+
+    text : str
+    """
+    return re.sub('[^A-Z]', '', text.upper())
+
+
+def check_text(text):
+    """Makes sure text is a string"""
+    if type(text) is not str:
+        raise ValueError('Can only encrypt strings.')
+
+
+def check_key(key):
+    """Makes sure key is a string or bytes and returns it as a string"""
+    if not utils.is_text(key):
+        raise ValueError('Can only use strings or bytes as keys.')
+    return memoryview(key).tobytes()
+
+
+def check_factor(factor, offset):
+    """Makes sure factor is an int coprime to 26 and offset an int"""
+    if type(factor) not in (int, long):
+        raise ValueError('factor must be an int.')
+    if type(offset) not in (int, long):
+        raise ValueError('offset must be an int.')
+    if factor % 2 == 0 or factor % 13 == 0:
+        raise ValueError('factor value must not be divisible by 2 or 13.')
+
+
+def caesar_encrypt(text, offset, factor=1):
+    """E(x) = (factor * x + offset) % 26"""
+    check_text(text)
+    check_factor(factor, offset)
+    A = ord('A')
+    return ''.join([chr((factor * (ord(letter) - A) + offset) % 26 + A)
+                    for letter in fix_text(text)])
+
+
+def caesar_decrypt(text, offset, factor=1):
+    """D(x) = factor^-1 * (x - offset) % 26"""
+    check_text(text)
+    check_factor(factor, offset)
+    factor_inv = utils.modinv(factor % 26, 26)
+    A = ord('A')
+    return ''.join([chr((factor_inv * (ord(letter) - A - offset)) % 26 + A)
+                    for letter in fix_text(text)])
+
+
+def vigenere_encrypt(text, password):
+    """E(text[i]) = (text[i] + password[i]) % 26"""
+    check_text(text)
+    password = fix_text(check_key(password))
+    text = fix_text(text)
+    if text and not password:
+        raise ValueError('Password must contain a letter.')
+    A = ord('A')
+    return ''.join([caesar_encrypt(letter, ord(password[i % len(password)])
+                                   - A)
+                    for i, letter in enumerate(text)])
+
+
+def vigenere_decrypt(text, password):
+    """D(text[i]) = (text[i] - password[i]) % 26"""
+    check_text(text)
+    password = fix_text(check_key(password))
+    text = fix_text(text)
+    if text and not password:
+        raise ValueError('Password must contain a letter.')
+    A = ord('A')
+    return ''.join([caesar_decrypt(letter, ord(password[i % len(password)])
+                                   - A)
+                    for i, letter in enumerate(text)])
+
+
+def onetimepad_encrypt(text, key):
+    """E(x) = vigenere_encrypt(text, key)"""
+    check_text(text)
+    key = check_key(key)
+    if len(key) < len(text):
+        raise ValueError('key must be at least the same length as text.')
+    return vigenere_encrypt(fix_text(text), fix_text(key))
+
+
+def onetimepad_decrypt(text, key):
+    """D(x) = vigenere_decrypt(text, key)"""
+    check_text(text)
+    key = check_key(key)
+    if len(key) < len(text):
+        raise ValueError('key must be at least the same length as text.')
+    return vigenere_decrypt(fix_text(text), fix_text(key))
+
+
+def playfair_padding(padding):
+    """Checks a padding character, merging J into I"""
+    if type(padding) is not str or len(padding) != 1 or \
+            not padding.isalpha():
+        raise ValueError('The padding must be a single letter.')
+    padding = padding.upper()
+    return padding if padding != 'J' else 'I'
+
+
+def playfair_grid(password):
+    """Generates the grid as two dictionaries, letter to cell and back"""
+    password = check_key(password)
+    alphabet = "ABCDEFGHIKLMNOPQRSTUVWXYZ"
+    grid = dict()
+    i = 0
+    for letter in fix_text(password):
+        if letter == 'J':
+            letter = 'I'
+        if letter not in grid:
+            grid[letter] = (i / 5, i % 5)
+            alphabet = alphabet.replace(letter, '')
+            i += 1
+    for letter in alphabet:
+        grid[letter] = (i / 5, i % 5)
+        i += 1
+    return grid, dict((cell, letter) for letter, cell in grid.iteritems())
+
+
+def playfair_digraphs(text, double_padding, end_padding,
+                      alternate_end_padding):
+    """Splits the text into digraphs, inserting the padding"""
+    double_padding = playfair_padding(double_padding)
+    end_padding = playfair_padding(end_padding)
+    alternate_end_padding = playfair_padding(alternate_end_padding)
+    text = fix_text(text).replace('J', 'I')
+    digraphs = []
+    counter = 0
+    while counter < len(text):
+        if counter + 1 == len(text):
+            if text[counter] != end_padding:
+                digraphs.append(text[counter] + end_padding)
+            else:
+                digraphs.append(text[counter] + alternate_end_padding)
+            break
+        elif text[counter] != text[counter + 1]:
+            digraphs.append(text[counter] + text[counter + 1])
+            counter += 2
+        else:
+            digraphs.append(text[counter] + double_padding)
+            counter += 1
+    return digraphs
+
+
+def playfair_shift(text, password, shift, double_padding, end_padding,
+                   alternate_end_padding):
+    """Replaces every digraph of text, shifting by shift along the grid"""
+    check_text(text)
+    grid, rev_grid = playfair_grid(password)
+    output = []
+    for digraph in playfair_digraphs(text, double_padding, end_padding,
+                                     alternate_end_padding):
+        (row1, col1), (row2, col2) = grid[digraph[0]], grid[digraph[1]]
+        if row1 == row2:
+            output.append(rev_grid[(row1, (col1 + shift) % 5)] +
+                          rev_grid[(row2, (col2 + shift) % 5)])
+        elif col1 == col2:
+            output.append(rev_grid[((row1 + shift) % 5, col1)] +
+                          rev_grid[((row2 + shift) % 5, col2)])
+        else:
+            output.append(rev_grid[(row1, col2)] + rev_grid[(row2, col1)])
+    return ''.join(output)
+
+
+def playfair_encrypt(text, password, double_padding='X', end_padding='Z',
+                     alternate_end_padding='X'):
+    """Encrypts text using the Playfair cipher"""
+    return playfair_shift(text, password, 1, double_padding, end_padding,
+                          alternate_end_padding)
+
+
+def playfair_decrypt(text, password, double_padding='X', end_padding='Z',
+                     alternate_end_padding='X'):
+    """Decrypts text using the Playfair cipher"""
+    return playfair_shift(text, password, -1, double_padding, end_padding,
+                          alternate_end_padding)
+
+
+def check_size(text, size):
+    """Makes sure size is a valid collumn size for text"""
+    check_text(text)
+    if type(size) is not int or size < 1:
+        raise ValueError('size must be a positive int.')
+    if not size < len(text):
+        raise ValueError('size must be less than the length of the text.')
+
+
+def skytale_encrypt(text, size):
+    """Writes text down size rows of collumns and reads it row by row"""
+    check_size(text, size)
+    text = fix_text(text)
+    width = -(-len(text) // size)
+    grid = [[''] * width for _ in range(size)]
+    for i, letter in enumerate(text):
+        grid[i % size][i / size] = letter
+    return ''.join([''.join(row) for row in grid])
+
+
+def skytale_decrypt(text, size):
+    """Inverse of skytale_encrypt, for texts that fill the whole grid"""
+    check_size(text, size)
+    text = fix_text(text)
+    if len(text) % size:
+        raise Unsupported('the text must fill the whole grid.')
+    width = len(text) / size
+    grid = [[''] * size for _ in range(width)]
+    for i, letter in enumerate(text):
+        grid[i % width][i / width] = letter
+    return ''.join([''.join(row) for row in grid])
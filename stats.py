@@ -0,0 +1,211 @@
+"""Letter statistics for the PyCiphers library
+
+Statistics([alphabet, periods]):
+    Unigram, bigram and period-sliced counts of the symbols of a text
+
+    The text is fed in chunks of any size with update, and two Statistics
+    can be merged, so large texts may be split across processes.
+
+    alphabet : Alphabet
+    periods : list of int
+
+Statistics.update(text):
+    Counts the symbols of the next chunk of text
+
+    text : string, bytearray or memoryview
+
+Statistics.merge(other[, contiguous]):
+    Adds the counts of other, as if its text followed this one
+
+    other : Statistics
+    contiguous : bool, False if the texts are unrelated
+
+Statistics.coincidence([period]):
+    Returns the index of coincidence, averaged over the slices of period
+
+    period : int
+
+from_chunks(chunks[, alphabet, periods]):
+    Collects the statistics of an iterator of texts
+
+    chunks : iterable of strings
+
+from_file(path[, alphabet, periods, chunk_size]):
+    Collects the statistics of a file, reading chunk_size bytes at a time
+
+    path : string
+    chunk_size : int
+
+index_of_coincidence(counts):
+    Probability that two symbols drawn from counts are the same
+
+    counts : array of int
+"""
+
+
+import numpy as np
+from alphabet import Alphabet, UPPERCASE
+
+
+class StatisticsError(Exception):
+    """Statistics Exception Class"""
+    def __init__(self, message):
+        super(StatisticsError, self).__init__(message)
+        print message
+
+
+def index_of_coincidence(counts):
+    """Probability that two symbols drawn from counts are the same
+
+    counts : array of int
+    """
+    total = counts.sum()
+    if total < 2:
+        return 0.0
+    return float((counts * (counts - 1)).sum()) / (total * (total - 1))
+
+
+class Statistics(object):
+    """Unigram, bigram and period-sliced counts of the symbols of a text
+
+    length : number of symbols counted
+    unigrams : array of size counts
+    bigrams : size x size array, bigrams[a, b] counts a followed by b
+    sliced : dict, sliced[period][i] counts the symbols at positions i
+             modulo period
+    """
+    def __init__(self, alphabet=UPPERCASE, periods=()):
+        if not isinstance(alphabet, Alphabet):
+            raise StatisticsError('alphabet must be an Alphabet.')
+        for period in periods:
+            if type(period) is not int or period < 1:
+                raise StatisticsError('periods must be positive ints.')
+
+        size = alphabet.size
+        self.alphabet = alphabet
+        self.periods = tuple(sorted(set(periods)))
+        self.length = 0
+        self.first = -1
+        self.last = -1
+        self.unigrams = np.zeros(size, dtype=np.int64)
+        self.bigrams = np.zeros((size, size), dtype=np.int64)
+        self.sliced = dict((period, np.zeros((period, size), dtype=np.int64))
+                           for period in self.periods)
+
+    def update(self, text):
+        """Counts the symbols of the next chunk of text
+
+        text : string, bytearray or memoryview
+        """
+        size = self.alphabet.size
+        symbols = self.alphabet.encode(text).astype(np.intp)
+        if not len(symbols):
+            return self
+
+        self.unigrams += np.bincount(symbols, minlength=size)
+        if self.last >= 0:
+            self.bigrams[self.last, symbols[0]] += 1
+        self.bigrams += np.bincount(
+            symbols[:-1] * size + symbols[1:],
+            minlength=size * size).reshape(size, size)
+        for period in self.periods:
+            phase = (np.arange(len(symbols)) + self.length) % period
+            self.sliced[period] += np.bincount(
+                phase * size + symbols,
+                minlength=period * size).reshape(period, size)
+
+        if self.first < 0:
+            self.first = symbols[0]
+        self.last = symbols[-1]
+        self.length += len(symbols)
+        return self
+
+    def merge(self, other, contiguous=True):
+        """Adds the counts of other, as if its text followed this one
+
+        When contiguous is False, the texts are treated as unrelated, so
+        no bigram joins them and the slices of both start at position 0.
+
+        other : Statistics
+        contiguous : bool
+        """
+        if not isinstance(other, Statistics):
+            raise StatisticsError('Can only merge Statistics.')
+        # the same symbols with other aliases or case folding count other texts
+        if other.alphabet.symbols != self.alphabet.symbols or \
+                not np.array_equal(other.alphabet.encoder,
+                                   self.alphabet.encoder):
+            raise StatisticsError('Can only merge Statistics of the same \
+alphabet.')
+        if other.periods != self.periods:
+            raise StatisticsError('Can only merge Statistics of the same \
+periods.')
+        if not other.length:
+            return self
+
+        self.unigrams += other.unigrams
+        self.bigrams += other.bigrams
+        if contiguous and self.last >= 0:
+            self.bigrams[self.last, other.first] += 1
+        for period in self.periods:
+            shift = self.length % period if contiguous else 0
+            self.sliced[period] += np.roll(other.sliced[period], shift, 0)
+
+        if self.first < 0:
+            self.first = other.first
+        self.last = other.last
+        self.length += other.length
+        return self
+
+    def __add__(self, other):
+        merged = Statistics(self.alphabet, self.periods)
+        return merged.merge(self).merge(other)
+
+    def frequencies(self):
+        """Returns the relative frequency of each symbol"""
+        return self.unigrams / float(max(self.length, 1))
+
+    def coincidence(self, period=None):
+        """Returns the index of coincidence of the text
+
+        With a period, returns the average index of coincidence of the
+        slices of the text at positions i modulo period, which is high
+        when period is a multiple of the length of a Vigenere password.
+
+        period : int
+        """
+        if period is None:
+            return index_of_coincidence(self.unigrams)
+        if period not in self.sliced:
+            raise StatisticsError('period ' + str(period) + ' was not \
+collected.')
+        return sum([index_of_coincidence(counts)
+                    for counts in self.sliced[period]]) / period
+
+
+def from_chunks(chunks, alphabet=UPPERCASE, periods=()):
+    """Collects the statistics of an iterator of texts
+
+    The chunks are treated as consecutive parts of one text.
+
+    chunks : iterable of strings, bytearrays or memoryviews
+    alphabet : Alphabet
+    periods : list of int
+    """
+    statistics = Statistics(alphabet, periods)
+    for chunk in chunks:
+        statistics.update(chunk)
+    return statistics
+
+
+def from_file(path, alphabet=UPPERCASE, periods=(), chunk_size=1 << 20):
+    """Collects the statistics of a file, reading chunk_size bytes at a time
+
+    path : string
+    alphabet : Alphabet
+    periods : list of int
+    chunk_size : int
+    """
+    with open(path, 'rb') as text_file:
+        return from_chunks(iter(lambda: text_file.read(chunk_size), ''),
+                           alphabet, periods)
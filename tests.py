@@ -6,16 +6,55 @@ Then ensures that all the right Exceptions occur when methods are misscalled
 """
 
 import unittest
+import alphabet
+import attack
+import benchmarks
+import cache
+import fuzz
+import os
+import tempfile
+import threading
+import time
 import Caesar
 import Vigenere
 import OneTimePad as OTP
 import Playfair
 import Skytale
+import stats
 
 
 ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 
 
+class TestAlphabet(unittest.TestCase):
+    """Alphabet unittest
+    """
+    def test_alphabet(self):
+        """Tests creation of Alphabets"""
+        self.assertEqual(len(alphabet.UPPERCASE), 26)
+        self.assertEqual(len(alphabet.ALPHANUMERIC), 36)
+        self.assertEqual(len(alphabet.LATIN1), 256)
+        with self.assertRaises(alphabet.AlphabetError):
+            alphabet.Alphabet(26)
+        with self.assertRaises(alphabet.AlphabetError):
+            alphabet.Alphabet('ABA')
+        with self.assertRaises(alphabet.AlphabetError):
+            alphabet.Alphabet('AB', aliases={'C': 'D'})
+
+    def test_encode(self):
+        """Tests encode and decode functions for Alphabets"""
+        self.assertEqual(list(alphabet.UPPERCASE.encode('a, B z')), [0, 1, 25])
+        self.assertEqual(alphabet.UPPERCASE.decode([0, 1, 25]), 'ABZ')
+        merged = alphabet.Alphabet('ABCDEFGHIKLMNOPQRSTUVWXYZ',
+                                   fold_case=True, aliases={'J': 'I'})
+        self.assertEqual(merged.normalize('Jiji 42'), 'IIII')
+        self.assertEqual(alphabet.ALPHANUMERIC.normalize('id-42a'), 'ID42A')
+        text = ''.join([chr(code) for code in range(255, -1, -1)])
+        self.assertEqual(alphabet.LATIN1.normalize(text), text)
+        with self.assertRaises(alphabet.AlphabetError):
+            alphabet.UPPERCASE.normalize(u'abc')
+
+
 class TestCaesar(unittest.TestCase):
     """Caesar cipher unittest
     """
@@ -31,6 +70,16 @@ class TestCaesar(unittest.TestCase):
             Caesar.encrypt(ALPHABET, 1, 39)
         with self.assertRaises(Caesar.CaesarError):
             Caesar.encrypt(ALPHABET, 1, 20)
+        self.assertEqual(Caesar.encrypt('id-42z', 1, 1, alphabet.ALPHANUMERIC),
+                         'JE530')
+        with self.assertRaises(Caesar.CaesarError):
+            Caesar.encrypt(ALPHABET, 1, 3, alphabet.ALPHANUMERIC)
+        with self.assertRaises(Caesar.CaesarError):
+            Caesar.encrypt(ALPHABET, 1, 3.0)
+        with self.assertRaises(Caesar.CaesarError):
+            Caesar.encrypt('', 1.5, low_memory=True)
+        self.assertEqual(Caesar.encrypt(ALPHABET, 10 ** 20, 3 ** 41),
+                         Caesar.encrypt(ALPHABET, 10 ** 20 % 26, 3 ** 41 % 26))
 
     def test_decrypt(self):
         """Tests decrypt function for Caesar cipher"""
@@ -44,6 +93,15 @@ class TestCaesar(unittest.TestCase):
             Caesar.decrypt(ALPHABET, 1, 39)
         with self.assertRaises(Caesar.CaesarError):
             Caesar.decrypt(ALPHABET, 1, 20)
+        with self.assertRaises(Caesar.CaesarError):
+            Caesar.decrypt(ALPHABET, 1, 3.0, low_memory=True)
+        self.assertEqual(Caesar.decrypt('JE530', 1, 1, alphabet.ALPHANUMERIC),
+                         'ID42Z')
+        self.assertEqual(Caesar.decrypt(ALPHABET, -10 ** 20, 3 ** 41),
+                         Caesar.decrypt(ALPHABET, 4, 3 ** 41 % 26))
+        text = 'Caf\xe9 \x00\xff'
+        self.assertEqual(Caesar.decrypt(Caesar.encrypt(
+            text, 200, 7, alphabet.LATIN1), 200, 7, alphabet.LATIN1), text)
 
 
 class TestVigenere(unittest.TestCase):
@@ -61,6 +119,12 @@ class TestVigenere(unittest.TestCase):
             Vigenere.encrypt(5, ALPHABET)
         with self.assertRaises(Vigenere.VigenereError):
             Vigenere.encrypt(ALPHABET, range(5))
+        with self.assertRaises(Vigenere.VigenereError):
+            Vigenere.encrypt(ALPHABET, '42')
+        self.assertEqual(Vigenere.encrypt('', ''), '')
+        self.assertEqual(Vigenere.encrypt('4 2', '42', low_memory=True), '')
+        self.assertEqual(
+            Vigenere.encrypt('A9', 'B', alphabet.ALPHANUMERIC), 'BA')
 
 
     def test_decrypt(self):
@@ -75,6 +139,9 @@ class TestVigenere(unittest.TestCase):
             Vigenere.decrypt(5, ALPHABET)
         with self.assertRaises(Vigenere.VigenereError):
             Vigenere.decrypt(ALPHABET, range(5))
+        text = 'Caf\xe9 \x00\xff'
+        self.assertEqual(Vigenere.decrypt(Vigenere.encrypt(
+            text, 'k\xe9y', alphabet.LATIN1), 'k\xe9y', alphabet.LATIN1), text)
 
 
 class TestOneTimePad(unittest.TestCase):
@@ -90,6 +157,10 @@ class TestOneTimePad(unittest.TestCase):
             OTP.encrypt(ALPHABET, OTP)
         with self.assertRaises(OTP.OneTimePadError):
             OTP.encrypt(ALPHABET, ALPHABET[:-1])
+        self.assertEqual(OTP.encrypt('', ''), '')
+        self.assertEqual(OTP.encrypt('...', '123'), '')
+        with self.assertRaises(OTP.OneTimePadError):
+            OTP.encrypt('a.', '12')
 
     def test_decrypt(self):
         """Tests decrypt function for One Time Pad cipher"""
@@ -97,6 +168,9 @@ class TestOneTimePad(unittest.TestCase):
                 ALPHABET, OTP.decrypt(OTP.encrypt(ALPHABET, ALPHABET), ALPHABET))
         with self.assertRaises(OTP.OneTimePadError):
             OTP.decrypt(521, OTP)
+        self.assertEqual(OTP.decrypt(OTP.encrypt(
+            'id42', '0123', alphabet.ALPHANUMERIC), '0123',
+            alphabet.ALPHANUMERIC), 'ID42')
         with self.assertRaises(OTP.OneTimePadError):
             OTP.encrypt(ALPHABET, OTP)
         with self.assertRaises(OTP.OneTimePadError):
@@ -154,6 +228,19 @@ class TestPlayfair(unittest.TestCase):
         with self.assertRaises(Playfair.PlayfairError):
             Playfair.check_padding('5', 'end')
 
+    def test_generate_digraphs(self):
+        """Tests generate_digraphs function for Playfair cipher
+        """
+        self.assertEqual(list(Playfair.generate_digraphs('Hello, balloon!')),
+                         ['HE', 'LX', 'LO', 'BA', 'LX', 'LO', 'ON'])
+        self.assertEqual(list(Playfair.generate_digraphs('')), [])
+        # spans several chunks, with double letters across their borders
+        text = 'aab' * 50000 + 'a'
+        self.assertEqual(
+            ''.join(Playfair.generate_digraphs(text)),
+            Playfair.ALPHABET.decode(Playfair.pad_digraphs(
+                Playfair.ALPHABET.encode(text))))
+
 
 class TestSkytale(unittest.TestCase):
     """Skytale cipher unittest
@@ -185,6 +272,380 @@ class TestSkytale(unittest.TestCase):
             Skytale.decrypt('Help', 5.0)
         with self.assertRaises(Skytale.SkytaleError):
             Skytale.decrypt('short', 5)
+        with self.assertRaises(Skytale.SkytaleError):
+            Skytale.decrypt('short', 0)
+        self.assertEqual(Skytale.decrypt(Skytale.encrypt(ALPHABET, 4), 4),
+                         ALPHABET)
+
+
+class TestStatistics(unittest.TestCase):
+    """Statistics unittest
+    """
+    TEXT = 'The quick brown fox jumps over the lazy dog ' * 7
+
+    def test_update(self):
+        """Tests that chunked statistics equal those of the whole text"""
+        whole = stats.Statistics(periods=[3, 4]).update(self.TEXT)
+        self.assertEqual(whole.length, 245)
+        self.assertEqual(whole.unigrams[ord('O') - ord('A')], 28)
+        self.assertEqual(whole.bigrams[ord('T') - ord('A'),
+                                       ord('H') - ord('A')], 14)
+        self.assertEqual(whole.bigrams.sum(), 244)
+        self.assertEqual(whole.sliced[3].sum(), 245)
+        chunks = [self.TEXT[i:i + 10] for i in range(0, len(self.TEXT), 10)]
+        chunked = stats.from_chunks(chunks, periods=[3, 4])
+        self.assertTrue((chunked.bigrams == whole.bigrams).all())
+        self.assertTrue((chunked.sliced[4] == whole.sliced[4]).all())
+        with self.assertRaises(stats.StatisticsError):
+            stats.Statistics(periods=[0])
+
+    def test_merge(self):
+        """Tests that merging partial statistics equals one pass"""
+        whole = stats.Statistics(periods=[5]).update(self.TEXT)
+        first = stats.Statistics(periods=[5]).update(self.TEXT[:101])
+        second = stats.Statistics(periods=[5]).update(self.TEXT[101:])
+        merged = first + second
+        self.assertTrue((merged.unigrams == whole.unigrams).all())
+        self.assertTrue((merged.bigrams == whole.bigrams).all())
+        self.assertTrue((merged.sliced[5] == whole.sliced[5]).all())
+        unrelated = first.merge(second, contiguous=False)
+        self.assertEqual(unrelated.bigrams.sum(), whole.bigrams.sum() - 1)
+        with self.assertRaises(stats.StatisticsError):
+            first.merge(stats.Statistics(periods=[4]))
+        folded = alphabet.Alphabet(alphabet.UPPERCASE.symbols,
+                                   aliases={'a': 'A'})
+        with self.assertRaises(stats.StatisticsError):
+            first.merge(stats.Statistics(folded, periods=[5]))
+
+    def test_coincidence(self):
+        """Tests that the index of coincidence reveals the Vigenere period"""
+        encrypted = Vigenere.encrypt(
+            'It was the best of times, it was the worst of times, it was the '
+            'age of wisdom, it was the age of foolishness, it was the epoch '
+            'of belief, it was the epoch of incredulity, it was the season of '
+            'Light, it was the season of Darkness, it was the spring of hope, '
+            'it was the winter of despair, we had everything before us, we '
+            'had nothing before us', 'lemon')
+        statistics = stats.Statistics(periods=range(1, 9)).update(encrypted)
+        self.assertEqual(max(range(1, 9), key=statistics.coincidence), 5)
+        self.assertAlmostEqual(statistics.coincidence(), stats.index_of_coincidence(
+            statistics.unigrams))
+        with self.assertRaises(stats.StatisticsError):
+            statistics.coincidence(9)
+
+
+class TestAttack(unittest.TestCase):
+    """Dictionary attack unittest
+    """
+    TEXT = ('It was the best of times, it was the worst of times, it was '
+            'the age of wisdom, it was the age of foolishness')
+    WORDS = ['apple', 'Lemon', 'lemonlemon', 'orange', 'monarchy',
+             'monarchyb', 'grape', 'abc', 'kiwi', '', '42']
+
+    def test_keys(self):
+        """Tests that equivalent passwords are recognised"""
+        self.assertEqual(attack.vigenere_key('lemon-LEMON'), 'LEMON')
+        self.assertEqual(attack.vigenere_key('abab a'), 'ABABA')
+        self.assertEqual(attack.playfair_key('monarchyb'), 'MONARCHY')
+        self.assertEqual(attack.playfair_key('Jiji'), 'I')
+        self.assertEqual(attack.playfair_key('abc'), '')
+        self.assertEqual(attack.vigenere_key(u'lemon'), 'LEMON')
+        self.assertEqual(attack.playfair_key(bytearray('monarchyb')),
+                         'MONARCHY')
+        self.assertEqual(attack.vigenere_key(memoryview('abab')), 'AB')
+        with self.assertRaises(attack.AttackError):
+            attack.vigenere_key(5)
+
+    def test_unique_keys(self):
+        """Tests that keys are deduplicated across blocks, in order"""
+        words = ['b', 'a', 'b', 'c', None, 'a', 'd', 'c', 'e'] * 3 + \
+            [str(number) for number in range(100)] * 2
+        for block_size in (1, 2, 3, 1000):
+            self.assertEqual(list(attack._unique_keys(
+                words, lambda word: word, block_size)),
+                             ['b', 'a', 'c', 'd', 'e'] +
+                             [str(number) for number in range(100)])
+
+    def test_attack_vigenere(self):
+        """Tests dictionary attack on Vigenere cipher"""
+        encrypted = Vigenere.encrypt(self.TEXT, 'lemon')
+        for processes in (1, 2):
+            candidates = attack.attack_vigenere(
+                encrypted, self.WORDS, top=3, prefix=20, processes=processes,
+                batch_size=2)
+            self.assertEqual(len(candidates), 3)
+            self.assertEqual(candidates[0][1:], ('LEMON', Caesar.encrypt(
+                self.TEXT, 0)))
+        with self.assertRaises(attack.AttackError):
+            attack.attack_vigenere(encrypted, self.WORDS, top=0)
+        with self.assertRaises(attack.AttackError):
+            attack.attack_vigenere('42 - 17', self.WORDS)
+
+    def test_attack_playfair(self):
+        """Tests dictionary attack on Playfair cipher"""
+        encrypted = Playfair.encrypt(self.TEXT, 'monarchy')
+        candidates = attack.attack_playfair(
+            encrypted, self.WORDS, top=20, prefix=20, processes=1)
+        self.assertEqual(len(candidates), 7)
+        self.assertEqual(candidates[0][1:], ('MONARCHY', Playfair.decrypt(
+            encrypted, 'monarchy')))
+        with self.assertRaises(attack.AttackError):
+            attack.attack_playfair(5, self.WORDS)
+        with self.assertRaises(attack.AttackError):
+            attack.attack_playfair('', self.WORDS)
+
+    def test_wordlists(self):
+        """Tests wordlists given as unicode paths, unicode or bytes"""
+        encrypted = Vigenere.encrypt(self.TEXT, 'lemon')
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            with open(path, 'wb') as words:
+                words.write('\n'.join(self.WORDS))
+            for wordlist in (unicode(path), [unicode(word) for word in
+                                             self.WORDS],
+                             [bytearray(word) for word in self.WORDS]):
+                self.assertEqual(attack.attack_vigenere(
+                    encrypted, wordlist, top=1, processes=1)[0][1], 'LEMON')
+        finally:
+            os.remove(path)
+
+    def test_threads(self):
+        """Tests that attacks in different threads do not mix their texts"""
+        results = {}
+
+        def words():
+            """Yields the words, letting the other thread run in between"""
+            for word in self.WORDS + [first + second for first in ALPHABET
+                                      for second in ALPHABET[:8]]:
+                time.sleep(0.0001)
+                yield word
+
+        def run(password):
+            """Attacks a text encrypted with password"""
+            encrypted = Vigenere.encrypt(self.TEXT * 5, password)
+            results[password] = [attack.attack_vigenere(
+                encrypted, words(), top=1, processes=1,
+                batch_size=1)[0][1] for _ in range(3)]
+        threads = [threading.Thread(target=run, args=(password,))
+                   for password in ('lemon', 'grape')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {'lemon': ['LEMON'] * 3,
+                                   'grape': ['GRAPE'] * 3})
+
+
+class TestCache(unittest.TestCase):
+    """Result cache unittest
+    """
+    def test_cache(self):
+        """Tests hits, misses and types of cached results"""
+        results = cache.ResultCache()
+        encrypt = cache.memoize(Caesar.encrypt, results)
+        self.assertEqual(encrypt(ALPHABET, 10), Caesar.encrypt(ALPHABET, 10))
+        self.assertEqual(encrypt(ALPHABET, 10), Caesar.encrypt(ALPHABET, 10))
+        self.assertEqual((results.hits, results.misses, len(results)), (1, 1, 1))
+        encrypted = encrypt(bytearray(ALPHABET), 10)
+        self.assertIs(type(encrypted), bytearray)
+        encrypted[0] = 'A'
+        self.assertEqual(encrypt(ALPHABET, 10), Caesar.encrypt(ALPHABET, 10))
+        self.assertEqual(cache.decrypt(Vigenere, ALPHABET, bytearray('key'),
+                                       cache=results),
+                         Vigenere.decrypt(ALPHABET, 'key'))
+        self.assertEqual(results.misses, 2)
+        encrypt(ALPHABET, 11, cache=False)
+        self.assertEqual((results.hits, results.misses), (3, 2))
+        with self.assertRaises(Caesar.CaesarError):
+            encrypt(5, 5)
+        with self.assertRaises(cache.CacheError):
+            encrypt(ALPHABET, 10, cache=5)
+
+    def test_eviction(self):
+        """Tests that the cache stays within max_bytes"""
+        results = cache.ResultCache(3 * (2 * 26 + cache.ENTRY_OVERHEAD))
+        for offset in range(5):
+            cache.encrypt(Caesar, ALPHABET, offset, cache=results)
+        self.assertEqual((len(results), results.evictions), (3, 2))
+        self.assertTrue(results.size <= results.max_bytes)
+        cache.encrypt(Caesar, ALPHABET, 4, cache=results)
+        cache.encrypt(Caesar, ALPHABET, 0, cache=results)
+        self.assertEqual((results.hits, results.misses), (1, 6))
+        results.clear()
+        self.assertEqual((len(results), results.size, results.hits), (0, 0, 0))
+        cache.encrypt(Vigenere, ALPHABET, 'K' * 10000, cache=results)
+        self.assertEqual(len(results), 0)
+
+    def test_argument_types(self):
+        """Tests that a hit is not returned for arguments of another type"""
+        results = cache.ResultCache()
+        cache.encrypt(Playfair, 'hello', 'key', 'X', cache=results)
+        with self.assertRaises(Playfair.PlayfairError):
+            cache.encrypt(Playfair, 'hello', 'key', bytearray('X'),
+                          cache=results)
+        self.assertEqual(results.hits, 0)
+
+    def test_one_time_pad(self):
+        """Tests that One-Time Pad results are never cached"""
+        results = cache.ResultCache()
+        with self.assertRaises(cache.CacheError):
+            cache.memoize(OTP.encrypt, results)
+        self.assertEqual(
+            cache.encrypt(OTP, ALPHABET, ALPHABET, cache=results),
+            OTP.encrypt(ALPHABET, ALPHABET))
+        self.assertEqual((len(results), results.misses), (0, 0))
+
+    def test_threads(self):
+        """Tests that the cache can be shared between threads"""
+        results = cache.ResultCache(20 * (2 * 26 + cache.ENTRY_OVERHEAD))
+
+        def work():
+            for offset in range(200):
+                cache.encrypt(Caesar, ALPHABET, offset % 30, cache=results)
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.hits + results.misses, 800)
+        self.assertTrue(results.size <= results.max_bytes)
+        self.assertEqual(results.size, len(results) * (2 * 26 +
+                                                       cache.ENTRY_OVERHEAD))
+
+
+class TestBytes(unittest.TestCase):
+    """bytearray and memoryview unittest
+    """
+    def test_types(self):
+        """Tests that every cipher returns the type of its input"""
+        text = 'Help me, I am under Attack'
+        for text_type in (bytearray, memoryview):
+            for encrypted, expected in [
+                    (Caesar.encrypt(text_type(text), 3),
+                     Caesar.encrypt(text, 3)),
+                    (Vigenere.decrypt(text_type(text), bytearray('key')),
+                     Vigenere.decrypt(text, 'key')),
+                    (OTP.encrypt(text_type(text), text_type(text)),
+                     OTP.encrypt(text, text)),
+                    (Playfair.decrypt(text_type(text), text_type('monarchy')),
+                     Playfair.decrypt(text, 'monarchy')),
+                    (Skytale.encrypt(text_type(text), 5),
+                     Skytale.encrypt(text, 5))]:
+                self.assertIs(type(encrypted), text_type)
+                self.assertEqual(memoryview(encrypted).tobytes(), expected)
+
+    def test_empty(self):
+        """Tests that empty inputs give empty outputs"""
+        self.assertEqual(Caesar.encrypt(bytearray(), 3), bytearray())
+        self.assertEqual(Vigenere.encrypt(memoryview(''), 'key').tobytes(), '')
+        self.assertEqual(Playfair.encrypt(bytearray(), 'monarchy'), bytearray())
+
+
+class TestLowMemory(unittest.TestCase):
+    """Low memory mode unittest
+    """
+    def test_results(self):
+        """Tests that low memory mode gives the same results"""
+        text = ('Help me, I am under Attack! Meet me at the old mill ' * 3000)
+        for text_type in (str, bytearray, memoryview):
+            for function, arguments in [
+                    (Caesar.encrypt, (3, 5)), (Caesar.decrypt, (3, 5)),
+                    (Vigenere.encrypt, ('lemon',)),
+                    (Vigenere.decrypt, ('lemon',)),
+                    (OTP.encrypt, (text,)), (OTP.decrypt, (text,)),
+                    (Playfair.encrypt, ('monarchy',)),
+                    (Playfair.decrypt, ('monarchy',)),
+                    (Skytale.encrypt, (7,)), (Skytale.decrypt, (7,))]:
+                low_memory = function(text_type(text), *arguments,
+                                      low_memory=True)
+                self.assertIs(type(low_memory), text_type)
+                self.assertEqual(memoryview(low_memory).tobytes(),
+                                 function(text, *arguments))
+
+    @unittest.skipIf(benchmarks.resource is None,
+                     'peak memory can not be measured on this platform')
+    def test_memory(self):
+        """Tests that low memory mode stays within bounds"""
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            benchmarks.generate_text(path, 8 << 20)
+            results = [benchmarks.measure(cipher, 8 << 20, True, path)
+                       for cipher in sorted(benchmarks.CIPHERS)]
+        finally:
+            os.remove(path)
+        self.assertEqual(benchmarks.check(results, 4, 4 << 20), [])
+
+
+class TestFuzz(unittest.TestCase):
+    """Tests the fast paths against the reference implementations"""
+
+    def test_fuzz(self):
+        """Tests that no path diverges from the reference"""
+        self.assertIsNone(fuzz.fuzz(700, seed=1, parallel_every=350))
+
+    def test_minimize(self):
+        """Tests that a divergence is found and minimized"""
+        original = Caesar.encrypt
+
+        def broken(text, offset, factor=1, alphabet=alphabet.UPPERCASE,
+                   low_memory=False):
+            """Drops the last letter of long texts in low memory mode"""
+            output = original(text, offset, factor, alphabet, low_memory)
+            return output[:-1] if low_memory and len(output) > 3 else output
+        Caesar.encrypt = broken
+        try:
+            divergence = fuzz.fuzz(200, ciphers=['Caesar'], parallel_every=0)
+        finally:
+            Caesar.encrypt = original
+        self.assertEqual(divergence['path'], 'low_memory')
+        self.assertEqual(len(divergence['arguments'][0]), 4)
+        self.assertTrue(divergence['arguments'][0].isalpha())
+
+    def test_rejections(self):
+        """Tests that a path accepting what the reference rejects diverges"""
+        original = Playfair.encrypt
+
+        def lenient(text, password, double_padding='X', end_padding='Z',
+                    alternate_end_padding='X', low_memory=False):
+            """Ignores bad paddings in low memory mode"""
+            try:
+                return original(text, password, double_padding, end_padding,
+                                alternate_end_padding, low_memory)
+            except Playfair.PlayfairError:
+                if low_memory:
+                    return ''
+                raise
+        Playfair.encrypt = lenient
+        try:
+            divergence = fuzz.fuzz(2000, ciphers=['Playfair'],
+                                   parallel_every=0)
+        finally:
+            Playfair.encrypt = original
+        self.assertTrue(divergence['path'].startswith('low_memory'))
+        self.assertTrue(divergence['expected'].startswith('<raised'))
+        self.assertFalse(divergence['actual'].startswith('<raised'))
+
+    def test_letterless_passwords(self):
+        """Tests that rejecting unneeded letterless passwords diverges"""
+        original = Vigenere.normalize_password
+
+        def eager(password, symbols, low_memory=False,
+                  error=Vigenere.VigenereError):
+            """Rejects passwords without letters even for empty texts"""
+            password = original(password, symbols, low_memory, error)
+            if not len(password):
+                raise error('Password must contain a symbol of the alphabet.')
+            return password
+        Vigenere.normalize_password = eager
+        try:
+            divergence = fuzz.fuzz(2000, ciphers=['Vigenere'],
+                                   parallel_every=0)
+        finally:
+            Vigenere.normalize_password = original
+        self.assertFalse(divergence['expected'])
+        self.assertTrue(divergence['actual'].startswith('<raised'))
 
 
 unittest.main()
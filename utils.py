@@ -39,10 +39,53 @@ is_letter:
     Parameters
     ----------
     letter : str
+
+is_text:
+    Checks if its arguement is a string, bytearray or memoryview
+
+    Parameters
+    ----------
+    text : object
+
+as_codes:
+    Views the bytes of text as an array of character codes, without copying
+
+    Parameters
+    ----------
+    text : str, bytearray or memoryview
+
+    Returns
+    -------
+    codes : uint8 array
+
+chunk_size:
+    Number of characters the ciphers process at a time
+
+    Parameters
+    ----------
+    low_memory : bool
+
+    Returns
+    -------
+    LOW_MEMORY_CHUNK if low_memory, otherwise None for the whole text
+
+convert:
+    Returns the bytes of a bytearray as the given type
+
+    Parameters
+    ----------
+    output : bytearray
+    output_type : str | bytearray | memoryview
 """
 
 
 import re
+import numpy as np
+
+
+TEXT_TYPES = (str, bytearray, memoryview)
+# characters processed at a time in low memory mode
+LOW_MEMORY_CHUNK = 1 << 16
 
 
 def extended_gcd(a, b):
@@ -91,3 +134,41 @@ def is_letter(letter):
     if not ord('A') <= ord(letter) <= ord('Z'):
         return False
     return True
+
+
+def is_text(text):
+    """Checks if its arguement is a string, bytearray or memoryview"""
+    return type(text) in TEXT_TYPES
+
+
+def as_codes(text):
+    """Views the bytes of text as an array of character codes
+
+    text : str, bytearray or memoryview
+    """
+    if type(text) is memoryview:
+        return np.asarray(text)
+    return np.frombuffer(text, dtype=np.uint8)
+
+
+def chunk_size(low_memory):
+    """Number of characters the ciphers process at a time
+
+    None means the whole text at once.
+
+    low_memory : bool
+    """
+    return LOW_MEMORY_CHUNK if low_memory else None
+
+
+def convert(output, output_type):
+    """Returns the bytes of a bytearray as the given type
+
+    output : bytearray
+    output_type : str | bytearray | memoryview
+    """
+    if output_type is str:
+        return str(output)
+    if output_type is memoryview:
+        return memoryview(output)
+    return output